@@ -0,0 +1,53 @@
+"""Helpers de catálogo de enums do PostgreSQL compartilhados entre revisões.
+
+Nada é guardado entre chamadas: cada revisão consulta o ``pg_catalog`` no
+momento em que precisa, já que revisões anteriores podem ter alterado o banco.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+ENUM_CATALOG_QUERY = sa.text("""
+    SELECT t.typname, e.enumlabel
+    FROM pg_type t
+    LEFT JOIN pg_enum e ON e.enumtypid = t.oid
+    WHERE t.typname = ANY(:type_names)
+    """)
+
+
+def get_enum_catalog(conn, *type_names: str) -> dict:
+    """
+    Retorna ``{type_name: set(labels)}`` para os enums informados que existem
+    no banco, em uma única consulta (existência do tipo e seus valores).
+    """
+    catalog: dict = {}
+    for type_name, label in conn.execute(
+        ENUM_CATALOG_QUERY, {"type_names": list(type_names)}
+    ):
+        labels = catalog.setdefault(type_name, set())
+        if label is not None:
+            labels.add(label)
+    return catalog
+
+
+def get_enum_labels(conn, type_name: str) -> set:
+    """Retorna os valores já existentes de um enum do PostgreSQL."""
+    return get_enum_catalog(conn, type_name).get(type_name, set())
+
+
+def add_enum_values(conn, type_name: str, labels, existing=None) -> None:
+    """
+    Adiciona ao enum apenas os valores que ainda não existem. ``existing``
+    permite reaproveitar valores já lidos via ``get_enum_catalog``; sem ele o
+    ``pg_enum`` é consultado uma vez. ``ADD VALUE`` roda fora de transação,
+    por isso o ``autocommit_block()`` só é aberto quando há algo a adicionar.
+    """
+    if existing is None:
+        existing = get_enum_labels(conn, type_name)
+    missing = [label for label in labels if label not in existing]
+    if not missing:
+        return
+
+    with op.get_context().autocommit_block():
+        for label in missing:
+            op.execute(f"ALTER TYPE {type_name} ADD VALUE IF NOT EXISTS '{label}'")
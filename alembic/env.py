@@ -10,17 +10,12 @@ from alembic import context
 
 # Add the project root to sys.path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Make migration helpers in this directory (e.g. enum_helpers) importable
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 # Import all models
 from src.database.core import Base
-from src.entities.user import User
-from src.entities.transaction import Transaction
-from src.entities.category import Category
-from src.entities.bank import Bank
-from src.entities.merchant import Merchant
-from src.entities.merchant_alias import MerchantAlias
-from src.entities.open_finance_item import OpenFinanceItem
-from src.entities.open_finance_account import OpenFinanceAccount
+import src.entities  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -12,6 +12,8 @@ from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
+from enum_helpers import add_enum_values, get_enum_catalog
+
 # revision identifiers, used by Alembic.
 revision: str = "0b09e7de7ead"
 down_revision: Union[str, Sequence[str], None] = "0be917584281"
@@ -19,143 +21,154 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+# Single catalog round-trip covering both tables: table existence ("t"),
+# primary key ("p"), foreign keys ("f"), unique constraints ("u") and plain
+# indexes ("i"), keyed by the table that currently owns them.
+CATALOG_QUERY = sa.text("""
+    SELECT c.relname AS table_name, c.relname AS object_name, 't' AS kind
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema()
+      AND c.relkind = 'r'
+      AND c.relname IN ('payments', 'transactions')
+    UNION ALL
+    SELECT c.relname, con.conname, con.contype::text
+    FROM pg_constraint con
+    JOIN pg_class c ON c.oid = con.conrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema()
+      AND con.contype IN ('p', 'f', 'u')
+      AND c.relname IN ('payments', 'transactions')
+    UNION ALL
+    SELECT t.relname, i.relname, 'i'
+    FROM pg_index x
+    JOIN pg_class i ON i.oid = x.indexrelid
+    JOIN pg_class t ON t.oid = x.indrelid
+    JOIN pg_namespace n ON n.oid = t.relnamespace
+    WHERE n.nspname = current_schema()
+      AND NOT x.indisprimary
+      AND t.relname IN ('payments', 'transactions')
+    """)
+
+
+def _load_catalog(conn) -> dict:
+    """Returns {table_name: {kind: set(object_names)}} for payments/transactions."""
+    catalog: dict = {}
+    for table_name, object_name, kind in conn.execute(CATALOG_QUERY):
+        catalog.setdefault(table_name, {}).setdefault(kind, set()).add(object_name)
+    return catalog
+
+
+# Columns whose FK constraint is renamed payments_<col>_fkey <-> transactions_<col>_fkey
+FOREIGN_KEY_COLUMNS = ("bank_id", "category_id", "merchant_id", "user_id")
+
+
+def _run_batch(statements) -> None:
+    """Runs the given DDL statements in a single DO block (one round-trip)."""
+    if not statements:
+        return
+    op.execute(f"DO $$ BEGIN {' '.join(statements)} END $$;")
+
+
+def _index_renames(renames) -> list:
+    return [
+        f"ALTER INDEX {old_name} RENAME TO {new_name};"
+        for old_name, new_name in renames
+    ]
+
+
+def _constraint_renames(renames) -> list:
+    # RENAME CONSTRAINT only touches the catalog: unlike drop + re-add it does
+    # not re-validate every row of transactions against the referenced table.
+    return [
+        f"ALTER TABLE transactions RENAME CONSTRAINT {old_name} TO {new_name};"
+        for old_name, new_name in renames
+    ]
+
+
 def upgrade() -> None:
     """Upgrade schema."""
     conn = op.get_bind()
-    inspector = sa.inspect(conn)
-    tables = inspector.get_table_names()
+    catalog = _load_catalog(conn)
 
     # 1. Rename table
-    if "payments" in tables:
-        if "transactions" in tables:
+    # After the rename, the objects that were attached to 'payments' are the
+    # ones now living on 'transactions', so we keep using their cached entry.
+    if "payments" in catalog:
+        if "transactions" in catalog:
             # Check if transactions is empty or we should assume it's the "wrong" one
             # For this fix, providing we have 'payments', 'transactions' is likely the empty one from create_all
             op.drop_table("transactions")
         op.rename_table("payments", "transactions")
+        table_catalog = catalog["payments"]
+    else:
+        table_catalog = catalog.get("transactions")
 
     # Ensure 'transactions' table exists before proceeding with its constraints/indexes
-    if "transactions" in inspector.get_table_names():
-        # 2. Rename Primary Key Index
-        # Check current PK name on transactions
-        pk_constraint = inspector.get_pk_constraint("transactions")
-        pk_name = pk_constraint.get("name")
-
-        if pk_name == "payments_pkey":
-            op.execute("ALTER INDEX payments_pkey RENAME TO transactions_pkey")
-
-        # 3. Rename Other Indices
-        indexes = inspector.get_indexes("transactions")
-        index_names = [i["name"] for i in indexes]
+    if table_catalog is not None:
+        pk_names = table_catalog.get("p", set())
+        index_names = table_catalog.get("i", set())
+        fk_names = table_catalog.get("f", set())
+        uc_names = table_catalog.get("u", set())
 
+        # 2/3. Rename Primary Key Index and Other Indices
         index_map = {
+            "payments_pkey": "transactions_pkey",
             "ix_payments_bank_id": "ix_transactions_bank_id",
             "ix_payments_date": "ix_transactions_date",
             "ix_payments_open_finance_id": "ix_transactions_open_finance_id",
             "ix_payments_title": "ix_transactions_title",
             "ix_payments_user_id": "ix_transactions_user_id",
         }
-
-        for old_name, new_name in index_map.items():
-            if old_name in index_names:
-                op.execute(f"ALTER INDEX {old_name} RENAME TO {new_name}")
-
-        # 4. Rename Foreign Key Constraints
-        fks = inspector.get_foreign_keys("transactions")
-        fk_names = [fk["name"] for fk in fks]
-
-        # Map old FK name to (new_name, referent_table, referent_col, ondelete)
-        # Note: local_cols are implicit in the loop context typically, but we define specific changes
-
-        # Bank
-        if "payments_bank_id_fkey" in fk_names:
-            op.drop_constraint(
-                "payments_bank_id_fkey", "transactions", type_="foreignkey"
-            )
-            op.create_foreign_key(
-                "transactions_bank_id_fkey",
-                "transactions",
-                "banks",
-                ["bank_id"],
-                ["id"],
-            )
-
-        # Category
-        if "payments_category_id_fkey" in fk_names:
-            op.drop_constraint(
-                "payments_category_id_fkey", "transactions", type_="foreignkey"
-            )
-            op.create_foreign_key(
-                "transactions_category_id_fkey",
-                "transactions",
-                "categories",
-                ["category_id"],
-                ["id"],
-                ondelete="RESTRICT",
-            )
-
-        # Merchant
-        if "payments_merchant_id_fkey" in fk_names:
-            op.drop_constraint(
-                "payments_merchant_id_fkey", "transactions", type_="foreignkey"
-            )
-            op.create_foreign_key(
-                "transactions_merchant_id_fkey",
-                "transactions",
-                "merchants",
-                ["merchant_id"],
-                ["id"],
-            )
-
-        # User
-        if "payments_user_id_fkey" in fk_names:
-            op.drop_constraint(
-                "payments_user_id_fkey", "transactions", type_="foreignkey"
-            )
-            op.create_foreign_key(
-                "transactions_user_id_fkey",
-                "transactions",
-                "users",
-                ["user_id"],
-                ["id"],
-            )
-
-        # 5. Rename Unique Constraint
-        # Constraints specifically unique constraints are in get_unique_constraints? or implied?
-        # Actually inspector.get_unique_constraints("transactions")
-        unique_constraints = inspector.get_unique_constraints("transactions")
-        uc_names = [u["name"] for u in unique_constraints]
-
-        if "uq_payment_user_open_finance_id" in uc_names:
-            op.drop_constraint(
-                "uq_payment_user_open_finance_id", "transactions", type_="unique"
-            )
-            op.create_unique_constraint(
-                "uq_transaction_user_open_finance_id",
-                "transactions",
-                ["user_id", "open_finance_id"],
-            )
-        # Also Check if new one exists? If neither, maybe create?
-        # But usually upgrade follows schema. If uq_payment... is gone, maybe uq_transaction... is there.
-        # We can trust that if uq_payment... is missing, it's likely done.
+        existing_indexes = pk_names | index_names
+        index_statements = _index_renames(
+            [(old, new) for old, new in index_map.items() if old in existing_indexes]
+        )
+
+        # 4/5. Rename Foreign Key and Unique Constraints
+        constraint_map = {
+            f"payments_{column}_fkey": f"transactions_{column}_fkey"
+            for column in FOREIGN_KEY_COLUMNS
+        }
+        constraint_map["uq_payment_user_open_finance_id"] = (
+            "uq_transaction_user_open_finance_id"
+        )
+        existing_constraints = fk_names | uc_names
+        constraint_statements = _constraint_renames(
+            [
+                (old, new)
+                for old, new in constraint_map.items()
+                if old in existing_constraints
+            ]
+        )
+
+        # All index and constraint renames go out as one atomic DO block
+        _run_batch(index_statements + constraint_statements)
+        # If uq_payment... is missing, uq_transaction... is likely already there.
 
     # 6. Update Enum Type
     # Determine which type name to use for adding values
-    # Check if 'paymentmethod' exists
-    type_exists_query = sa.text("SELECT 1 FROM pg_type WHERE typname = 'paymentmethod'")
-    pm_exists = conn.execute(type_exists_query).scalar()
+    # One round-trip covers both type names and their labels: 'paymentmethod'
+    # decides the target, 'transactionmethod' decides whether the conflict
+    # cleanup DROP is needed, and the labels feed add_enum_values
+    enum_catalog = get_enum_catalog(conn, "paymentmethod", "transactionmethod")
+    pm_exists = "paymentmethod" in enum_catalog
 
     target_type = "paymentmethod" if pm_exists else "transactionmethod"
 
-    # Add new values to existing type (whichever it is)
-    with op.get_context().autocommit_block():
-        op.execute(f"ALTER TYPE {target_type} ADD VALUE IF NOT EXISTS 'bank_transfer'")
-        op.execute(f"ALTER TYPE {target_type} ADD VALUE IF NOT EXISTS 'transfer'")
-        op.execute(f"ALTER TYPE {target_type} ADD VALUE IF NOT EXISTS 'cash'")
+    # Add new values to existing type (whichever it is), skipping present ones
+    add_enum_values(
+        conn,
+        target_type,
+        ("bank_transfer", "transfer", "cash"),
+        existing=enum_catalog.get(target_type, set()),
+    )
 
     # Rename the type itself to 'transactionmethod' if it is still 'paymentmethod'
     if pm_exists:
-        # Check if 'transactionmethod' already exists (conflict cleanup)
-        op.execute("DROP TYPE IF EXISTS transactionmethod")
+        # Drop a conflicting 'transactionmethod' only when it actually exists
+        if "transactionmethod" in enum_catalog:
+            op.execute("DROP TYPE transactionmethod")
         op.execute("ALTER TYPE paymentmethod RENAME TO transactionmethod")
 
 
@@ -165,61 +178,27 @@ def downgrade() -> None:
     op.execute("ALTER TYPE transactionmethod RENAME TO paymentmethod")
     # Note: We cannot remove enum values easily in valid SQL downgrade without recreation. keeping them.
 
-    # 2. Rename Unique Constraint Back
-    op.drop_constraint(
-        "uq_transaction_user_open_finance_id", "transactions", type_="unique"
-    )
-    op.create_unique_constraint(
-        "uq_payment_user_open_finance_id",
-        "transactions",
-        ["user_id", "open_finance_id"],
-    )
-
-    # 3. Rename Foreign Keys Back
-    op.drop_constraint("transactions_user_id_fkey", "transactions", type_="foreignkey")
-    op.create_foreign_key(
-        "payments_user_id_fkey", "transactions", "users", ["user_id"], ["id"]
+    # 2-5. Rename Unique Constraint, Foreign Keys, Indices and PK Back,
+    # all in a single DO block so the downgrade never applies half of them
+    _run_batch(
+        _constraint_renames(
+            [("uq_transaction_user_open_finance_id", "uq_payment_user_open_finance_id")]
+            + [
+                (f"transactions_{column}_fkey", f"payments_{column}_fkey")
+                for column in FOREIGN_KEY_COLUMNS
+            ]
+        )
+        + _index_renames(
+            [
+                ("ix_transactions_user_id", "ix_payments_user_id"),
+                ("ix_transactions_title", "ix_payments_title"),
+                ("ix_transactions_open_finance_id", "ix_payments_open_finance_id"),
+                ("ix_transactions_date", "ix_payments_date"),
+                ("ix_transactions_bank_id", "ix_payments_bank_id"),
+                ("transactions_pkey", "payments_pkey"),
+            ]
+        )
     )
 
-    op.drop_constraint(
-        "transactions_merchant_id_fkey", "transactions", type_="foreignkey"
-    )
-    op.create_foreign_key(
-        "payments_merchant_id_fkey",
-        "transactions",
-        "merchants",
-        ["merchant_id"],
-        ["id"],
-    )
-
-    op.drop_constraint(
-        "transactions_category_id_fkey", "transactions", type_="foreignkey"
-    )
-    op.create_foreign_key(
-        "payments_category_id_fkey",
-        "transactions",
-        "categories",
-        ["category_id"],
-        ["id"],
-        ondelete="RESTRICT",
-    )
-
-    op.drop_constraint("transactions_bank_id_fkey", "transactions", type_="foreignkey")
-    op.create_foreign_key(
-        "payments_bank_id_fkey", "transactions", "banks", ["bank_id"], ["id"]
-    )
-
-    # 4. Rename Indices Back
-    op.execute("ALTER INDEX ix_transactions_user_id RENAME TO ix_payments_user_id")
-    op.execute("ALTER INDEX ix_transactions_title RENAME TO ix_payments_title")
-    op.execute(
-        "ALTER INDEX ix_transactions_open_finance_id RENAME TO ix_payments_open_finance_id"
-    )
-    op.execute("ALTER INDEX ix_transactions_date RENAME TO ix_payments_date")
-    op.execute("ALTER INDEX ix_transactions_bank_id RENAME TO ix_payments_bank_id")
-
-    # 5. Rename PK Back
-    op.execute("ALTER INDEX transactions_pkey RENAME TO payments_pkey")
-
     # 6. Rename Table Back
     op.rename_table("transactions", "payments")
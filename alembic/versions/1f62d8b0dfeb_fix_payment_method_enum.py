@@ -11,6 +11,8 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 
+from enum_helpers import add_enum_values
+
 
 # revision identifiers, used by Alembic.
 revision: str = "1f62d8b0dfeb"
@@ -34,12 +36,12 @@ def upgrade() -> None:
     # but simple ADD VALUE is fine in newer postgres versions (requires autocommit usually).
     # We use autocommit_block() context to ensure it runs outside a transaction.
 
-    with op.get_context().autocommit_block():
-        op.execute("ALTER TYPE paymentmethod ADD VALUE IF NOT EXISTS 'boleto'")
-        op.execute("ALTER TYPE paymentmethod ADD VALUE IF NOT EXISTS 'bill_payment'")
-        op.execute(
-            "ALTER TYPE paymentmethod ADD VALUE IF NOT EXISTS 'investment_redemption'"
-        )
+    # Only labels missing from pg_enum are added (one lookup, no-op on reruns).
+    add_enum_values(
+        op.get_bind(),
+        "paymentmethod",
+        ("boleto", "bill_payment", "investment_redemption"),
+    )
 
 
 def downgrade() -> None:
@@ -0,0 +1,48 @@
+"""add trigram index on merchant_aliases.pattern
+
+Revision ID: 3c8e1f5a9b27
+Revises: db5d99c51dde
+Create Date: 2026-03-02 10:12:45.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3c8e1f5a9b27"
+down_revision: Union[str, Sequence[str], None] = "db5d99c51dde"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY não bloqueia escrita em merchant_aliases durante o build,
+    # mas não pode rodar dentro de transação
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_merchant_alias_pattern_trgm",
+            "merchant_aliases",
+            ["pattern"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"pattern": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_merchant_alias_pattern_trgm",
+            table_name="merchant_aliases",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,72 @@
+"""delete orphan merchant aliases via trigger
+
+Revision ID: 4e6a1c8d2f90
+Revises: 9b4f2e7c1a58
+Create Date: 2026-03-03 11:05:52.174330
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4e6a1c8d2f90"
+down_revision: Union[str, Sequence[str], None] = "9b4f2e7c1a58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Só olha para os aliases que o próprio statement deixou de referenciar
+    # (tabela de transição), em vez de varrer todos os aliases do usuário
+    op.execute("""
+        CREATE OR REPLACE FUNCTION delete_orphan_merchant_aliases()
+        RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM merchant_aliases a
+            WHERE a.id IN (
+                SELECT o.merchant_alias_id FROM old_merchants o
+                WHERE o.merchant_alias_id IS NOT NULL
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM merchants m WHERE m.merchant_alias_id = a.id
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """)
+    # Tabelas de transição não aceitam mais de um evento por trigger
+    op.execute("""
+        CREATE TRIGGER merchants_cleanup_aliases_on_update
+        AFTER UPDATE ON merchants
+        REFERENCING OLD TABLE AS old_merchants
+        FOR EACH STATEMENT EXECUTE FUNCTION delete_orphan_merchant_aliases()
+        """)
+    op.execute("""
+        CREATE TRIGGER merchants_cleanup_aliases_on_delete
+        AFTER DELETE ON merchants
+        REFERENCING OLD TABLE AS old_merchants
+        FOR EACH STATEMENT EXECUTE FUNCTION delete_orphan_merchant_aliases()
+        """)
+
+    # Remove os aliases que já estavam órfãos antes do trigger existir
+    op.execute("""
+        DELETE FROM merchant_aliases a
+        WHERE NOT EXISTS (
+            SELECT 1 FROM merchants m WHERE m.merchant_alias_id = a.id
+        )
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "DROP TRIGGER IF EXISTS merchants_cleanup_aliases_on_delete ON merchants"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS merchants_cleanup_aliases_on_update ON merchants"
+    )
+    op.execute("DROP FUNCTION IF EXISTS delete_orphan_merchant_aliases()")
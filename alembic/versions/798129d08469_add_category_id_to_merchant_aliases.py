@@ -23,11 +23,20 @@ def upgrade() -> None:
     op.add_column(
         "merchant_aliases", sa.Column("category_id", sa.UUID(), nullable=True)
     )
+    # A coluna acabou de ser criada e está toda NULL: a validação da FK não
+    # tem linhas para checar, então NOT VALID + VALIDATE não ganharia nada
+    # (o add_column já segura ACCESS EXCLUSIVE até o fim da transação)
     op.create_foreign_key(
-        None, "merchant_aliases", "categories", ["category_id"], ["id"]
+        "merchant_aliases_category_id_fkey",
+        "merchant_aliases",
+        "categories",
+        ["category_id"],
+        ["id"],
     )
 
 
 def downgrade() -> None:
-    op.drop_constraint(None, "merchant_aliases", type_="foreignkey")
+    op.drop_constraint(
+        "merchant_aliases_category_id_fkey", "merchant_aliases", type_="foreignkey"
+    )
     op.drop_column("merchant_aliases", "category_id")
@@ -0,0 +1,57 @@
+"""add merchant alias lookup indexes
+
+Revision ID: 7d2a4b9e6c13
+Revises: 3c8e1f5a9b27
+Create Date: 2026-03-02 10:48:17.902615
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2a4b9e6c13"
+down_revision: Union[str, Sequence[str], None] = "3c8e1f5a9b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (user_id, pattern) já é coberto pelo índice de uq_merchant_alias_user_pattern
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_merchant_aliases_user_scope_pattern",
+            "merchant_aliases",
+            ["user_id", "is_investment", "ignored", "pattern"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_merchants_merchant_alias_id"),
+            "merchants",
+            ["merchant_alias_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_merchants_merchant_alias_id"),
+            table_name="merchants",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_merchant_aliases_user_scope_pattern",
+            table_name="merchant_aliases",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
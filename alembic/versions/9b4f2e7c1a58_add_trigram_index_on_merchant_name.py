@@ -0,0 +1,48 @@
+"""add trigram index on merchants.name
+
+Revision ID: 9b4f2e7c1a58
+Revises: 7d2a4b9e6c13
+Create Date: 2026-03-03 09:21:37.640118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4f2e7c1a58"
+down_revision: Union[str, Sequence[str], None] = "7d2a4b9e6c13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY não bloqueia escrita em merchants durante o build,
+    # mas não pode rodar dentro de transação
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_merchant_name_trgm",
+            "merchants",
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_merchant_name_trgm",
+            table_name="merchants",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -4,6 +4,11 @@ Revision ID: ae8ab5feb025
 Revises: 1f62d8b0dfeb
 Create Date: 2026-01-16 12:35:02.574129
 
+Atomicity: this revision must NOT use ``autocommit_block()``. Column adds,
+foreign keys and the data migration all run inside the single transaction
+opened by ``context.begin_transaction()`` in ``env.py``, so PostgreSQL either
+commits everything at once (one WAL flush) or rolls it all back.
+
 """
 
 from typing import Sequence, Union
@@ -43,21 +48,19 @@ def upgrade() -> None:
         ["id"],
     )
 
-    # Data Migration
-    op.execute(
-        """
-        UPDATE merchants
-        SET income_category_id = category_id
-        FROM categories
-        WHERE merchants.category_id = categories.id AND categories.type = 'income'
-    """
-    )
+    # Data Migration (single pass over merchants for both columns)
     op.execute(
         """
         UPDATE merchants
-        SET expense_category_id = category_id
+        SET income_category_id = CASE
+                WHEN categories.type = 'income' THEN merchants.category_id
+            END,
+            expense_category_id = CASE
+                WHEN categories.type = 'expense' THEN merchants.category_id
+            END
         FROM categories
-        WHERE merchants.category_id = categories.id AND categories.type = 'expense'
+        WHERE merchants.category_id = categories.id
+          AND categories.type IN ('income', 'expense')
     """
     )
 
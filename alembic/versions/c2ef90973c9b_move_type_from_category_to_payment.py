@@ -12,6 +12,8 @@ from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
+from enum_helpers import get_enum_catalog
+
 # revision identifiers, used by Alembic.
 revision: str = "c2ef90973c9b"
 down_revision: Union[str, Sequence[str], None] = "95a97440f1e6"
@@ -21,33 +23,41 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
+    conn = op.get_bind()
+
+    # One catalog probe answers both "create transactiontype?" and
+    # "drop categorytype?" instead of a checkfirst plus a DROP IF EXISTS
+    existing_types = get_enum_catalog(conn, "categorytype", "transactiontype")
+
     # Create the new enum type
-    transaction_type = sa.Enum("income", "expense", name="transactiontype")
-    transaction_type.create(op.get_bind(), checkfirst=True)
+    if "transactiontype" not in existing_types:
+        transaction_type = sa.Enum("income", "expense", name="transactiontype")
+        transaction_type.create(conn, checkfirst=False)
 
-    # Add column as nullable first
+    # Add column as NOT NULL DEFAULT 'expense': on PG 11+ this is a
+    # metadata-only change, so neither a rewrite nor a NULL check scan happens
     op.add_column(
         "payments",
         sa.Column(
-            "type", sa.Enum("income", "expense", name="transactiontype"), nullable=True
+            "type",
+            sa.Enum("income", "expense", name="transactiontype"),
+            nullable=False,
+            server_default=sa.text("'expense'"),
         ),
     )
 
-    # Data migration: Set Type based on Amount
-    op.execute("UPDATE payments SET type = 'expense' WHERE amount < 0")
+    # Data migration: only non-negative amounts differ from the default
     op.execute("UPDATE payments SET type = 'income' WHERE amount >= 0")
 
-    # Handle any nulls (safeguard, though above covers all numbers)
-    op.execute("UPDATE payments SET type = 'expense' WHERE type IS NULL")
-
-    # Alter to non-nullable
-    op.alter_column("payments", "type", nullable=False)
+    # Drop the temporary default
+    op.alter_column("payments", "type", server_default=None)
 
     # Drop old column
     op.drop_column("categories", "type")
 
-    # Drop old enum type if desired, or leave it
-    op.execute("DROP TYPE IF EXISTS categorytype")
+    # Drop old enum type, skipping the lock when it is already gone
+    if "categorytype" in existing_types:
+        op.execute("DROP TYPE categorytype")
 
 
 def downgrade() -> None:
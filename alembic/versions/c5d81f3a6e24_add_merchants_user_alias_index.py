@@ -0,0 +1,46 @@
+"""add merchants (user_id, merchant_alias_id) index
+
+Revision ID: c5d81f3a6e24
+Revises: 4e6a1c8d2f90
+Create Date: 2026-03-04 14:32:08.517263
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d81f3a6e24"
+down_revision: Union[str, Sequence[str], None] = "4e6a1c8d2f90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # merchant_aliases (user_id, pattern) já é coberto por
+    # uq_merchant_alias_user_pattern; em merchants o único índice com user_id
+    # é o da unique (name, user_id), que não serve para filtrar só pelo usuário
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_merchants_user_alias",
+            "merchants",
+            ["user_id", "merchant_alias_id"],
+            unique=False,
+            postgresql_include=["id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_merchants_user_alias",
+            table_name="merchants",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,64 @@
+"""add trigram indexes for category search
+
+Revision ID: e8b3d6f1a2c7
+Revises: c5d81f3a6e24
+Create Date: 2026-03-05 10:12:44.381905
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b3d6f1a2c7"
+down_revision: Union[str, Sequence[str], None] = "c5d81f3a6e24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # search_categories filtra com ILIKE '%termo%' em categories.name e
+    # user_category_settings.alias; gin_trgm_ops atende ILIKE com curinga inicial
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_category_name_trgm",
+            "categories",
+            ["name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_user_category_setting_alias_trgm",
+            "user_category_settings",
+            ["alias"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"alias": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_user_category_setting_alias_trgm",
+            table_name="user_category_settings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "idx_category_name_trgm",
+            table_name="categories",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -2,14 +2,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-from src.database.core import engine, Base
-from src.entities.transaction import Transaction
-from src.entities.category import Category
-from src.entities.user import User
-from src.entities.open_finance_item import OpenFinanceItem
+from src.database.core import engine, Base, warm_up_pool
+import src.entities  # noqa: F401 (registra todos os models)
 from src.api import register_routes
 from src.logging import configure_logging, LogLevels
 from src.exceptions.handlers import register_exception_handlers
+from src.config import settings
 import os
 
 configure_logging(LogLevels.info)
@@ -17,9 +15,14 @@ configure_logging(LogLevels.info)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Startup: Create tables (opt-in; Alembic owns the schema otherwise and
+    # create_all would reflect every table against the live DB on each boot)
+    if settings.CREATE_ALL_ON_STARTUP:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    # Abre as conexões do pool antes de aceitar requisições
+    if settings.DB_POOL_WARMUP > 0:
+        await warm_up_pool(min(settings.DB_POOL_WARMUP, settings.DB_POOL_SIZE))
     yield
     # Shutdown: Close database connection
     await engine.dispose()
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, status, Depends
-from typing import List
+from typing import List, Literal
 from uuid import UUID
 
 from ..database.core import DbSession
@@ -9,10 +9,11 @@ from ..auth.service import get_current_user
 from ..auth.model import TokenData
 
 from ..schemas.pagination import PaginatedResponse
-from fastapi import Query
 
 router = APIRouter(prefix="/aliases", tags=["Merchant Aliases"])
 
+AliasScope = Literal["general", "investment", "ignored", "all"]
+
 
 @router.get("/", response_model=PaginatedResponse[model.MerchantAliasResponse])
 async def get_merchant_aliases(
@@ -20,7 +21,7 @@ async def get_merchant_aliases(
     size: int = 20,
     db: DbSession = None,
     current_user: TokenData = Depends(get_current_user),
-    scope: str = Query(default="general", pattern="^(general|investment|ignored|all)$"),
+    scope: AliasScope = "general",
 ):
     return await service.get_merchant_aliases(current_user, db, page, size, scope)
 
@@ -32,7 +33,7 @@ async def search_aliases(
     size: int = 20,
     db: DbSession = None,
     current_user: TokenData = Depends(get_current_user),
-    scope: str = Query(default="general", pattern="^(general|investment|ignored|all)$"),
+    scope: AliasScope = "general",
 ):
     return await service.search_merchants_by_alias(
         current_user, db, query, page, size, scope
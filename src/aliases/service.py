@@ -1,13 +1,22 @@
 from datetime import datetime, timezone
-from uuid import uuid4, UUID
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.future import select
-from sqlalchemy import or_, delete, update, func
+from sqlalchemy import (
+    and_,
+    or_,
+    exists,
+    lambda_stmt,
+    literal,
+    update,
+    func,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
 from sqlalchemy.exc import IntegrityError
-from psycopg2.errors import UniqueViolation
-from asyncpg.exceptions import UniqueViolationError
 from . import model
+from ..database.errors import is_unique_violation
 from ..auth.model import TokenData
 from ..entities.merchant import Merchant
 from ..entities.merchant_alias import MerchantAlias
@@ -21,137 +30,163 @@ from ..exceptions.aliases import (
     MerchantNotBelongToAliasError,
 )
 from ..transactions.service import update_transactions_category_bulk
+from ..utils.ids import uuid7
+from ..utils.search import contains_pattern
 import logging
 from ..schemas.pagination import PaginatedResponse
 
+logger = logging.getLogger(__name__)
+
+# Acima disso a lista de merchants vai como um único parâmetro uuid[] em vez
+# de um IN (...) com um parâmetro por ID (Postgres apenas)
+MERCHANT_IDS_ARRAY_THRESHOLD = 100
+
+
+def _merchant_ids_criteria(db: AsyncSession, merchant_ids):
+    """
+    Retorna o filtro ``Merchant.id IN merchant_ids``. Para listas grandes no
+    Postgres, usa ``FROM unnest(:ids::uuid[])`` e filtra por JOIN: um único
+    parâmetro, resolvido pelo planner como hash join, no mesmo round trip.
+    """
+    if (
+        len(merchant_ids) <= MERCHANT_IDS_ARRAY_THRESHOLD
+        or db.get_bind().dialect.name != "postgresql"
+    ):
+        return Merchant.id.in_(merchant_ids)
+
+    unnested_ids = (
+        func.unnest(literal(list(merchant_ids), ARRAY(PG_UUID(as_uuid=True))))
+        .table_valued("id")
+        .render_derived()
+    )
+    return Merchant.id == unnested_ids.c.id
+
 
 # Merchant Alias operations
 async def create_merchant_alias_group(
-    current_user: TokenData, db: AsyncSession, alias_group: model.MerchantAliasCreate
+    current_user: TokenData,
+    db: AsyncSession,
+    alias_group: model.MerchantAliasCreate,
 ) -> MerchantAlias:
+    user_id = current_user.get_uuid()
     try:
-        new_alias_id = uuid4()
-        new_alias = MerchantAlias(
-            id=new_alias_id,
-            pattern=alias_group.pattern,
-            user_id=current_user.get_uuid(),
-            category_id=alias_group.category_id,
-            is_investment=alias_group.is_investment,
-            ignored=alias_group.ignored,
-        )
-        db.add(new_alias)
-        await db.flush()  # Garante que o Alias exista no banco antes de ser referenciado
+        # INSERT ... RETURNING: o alias volta já persistido e presente na
+        # sessão, sem flush do unit of work nem SELECT para os defaults do servidor.
+        # Pattern repetido não vira erro no banco: ON CONFLICT DO NOTHING não
+        # retorna linha e a transação segue válida (sem rollback)
+        new_alias_id = uuid7()
+        new_alias = (
+            await db.execute(
+                insert(MerchantAlias)
+                .values(
+                    id=new_alias_id,
+                    pattern=alias_group.pattern,
+                    user_id=user_id,
+                    category_id=alias_group.category_id,
+                    is_investment=alias_group.is_investment,
+                    ignored=alias_group.ignored,
+                )
+                .on_conflict_do_nothing(index_elements=["user_id", "pattern"])
+                .returning(MerchantAlias)
+            )
+        ).scalar_one_or_none()
+        if new_alias is None:
+            logger.warning(
+                "Alias já existente: %s pelo usuário %s", alias_group.pattern, user_id
+            )
+            raise MerchantAliasCreationError(
+                f"Já existe um alias com o padrão {alias_group.pattern}."
+            )
 
-        # Bulk update dos merchants para apontar para o novo alias
-        await db.execute(
+        # Bulk update dos merchants para apontar para o novo alias. O RETURNING
+        # traz os merchants realmente reatribuídos (já filtrados pelo usuário),
+        # dispensando o refresh do alias e a releitura dos IDs.
+        merchant_ids_criteria = _merchant_ids_criteria(db, alias_group.merchant_ids)
+        result = await db.execute(
             update(Merchant)
-            .where(
-                Merchant.id.in_(alias_group.merchant_ids),
-                Merchant.user_id == current_user.get_uuid(),
-            )
+            .where(merchant_ids_criteria, Merchant.user_id == user_id)
             .values(merchant_alias_id=new_alias_id)
+            .returning(Merchant)
         )
-
-        await db.commit()
-        await db.refresh(new_alias)
-        logging.info(
-            f"Novo alias registrado: {new_alias.pattern} -> merchants {alias_group.merchant_ids} pelo usuário {current_user.get_uuid()}"
-        )
+        merchants = result.scalars().all()
+        if not merchants:
+            # Sem merchants o alias nasceria vazio: o trigger de limpeza só
+            # dispara em UPDATE/DELETE de merchants e não o removeria
+            await db.rollback()
+            logger.warning(
+                "Nenhum merchant encontrado para o alias %s do usuário %s",
+                alias_group.pattern,
+                user_id,
+            )
+            raise MerchantAliasCreationError(
+                "Nenhum dos merchants informados foi encontrado."
+            )
+        set_committed_value(new_alias, "merchants", merchants)
 
         # Batch update existing payments for these merchants if a category was selected and requested
         if alias_group.category_id and alias_group.update_past_transactions:
             await update_transactions_category_bulk(
                 db,
-                current_user.get_uuid(),
-                alias_group.merchant_ids,
+                user_id,
+                [merchant.id for merchant in merchants],
                 alias_group.category_id,
+                commit=False,
             )
 
-        await _cleanup_empty_aliases(db, current_user.get_uuid())
+        await db.commit()
+        logger.info(
+            "Novo alias registrado: %s -> %d merchants pelo usuário %s",
+            new_alias.pattern,
+            len(merchants),
+            user_id,
+        )
         return new_alias
     except IntegrityError as e:
-        logging.error(
-            f"Falha na criação de alias: {alias_group.pattern} pelo usuário {current_user.get_uuid()}"
+        await db.rollback()
+        logger.error(
+            "Falha na criação de alias: %s pelo usuário %s",
+            alias_group.pattern,
+            user_id,
         )
-        if isinstance(e.orig, UniqueViolation) or (
-            UniqueViolationError and isinstance(e.orig, UniqueViolationError)
-        ):
+        if is_unique_violation(e):
             raise MerchantAliasCreationError(
                 f"Já existe um alias com o padrão {alias_group.pattern}."
             )
         raise MerchantAliasCreationError(str(e.orig))
 
 
-async def _cleanup_empty_aliases(db: AsyncSession, user_id: UUID) -> None:
-    """
-    Remove automaticamente aliases que não possuem nenhum merchant associado.
-    """
-    # Deleta aliases do usuário que não têm merchants
-    # In async/SQLAlchemy 2.0, standard way is delete().where(...)
-    # and checking for relationships might require a subquery or checking consistency.
-    # Logic: Delete MerchantAlias where user_id == user_id AND NOT EXISTS (select 1 from merchants where merchant_alias_id = alias.id)
-
-    # Alternatively, usage of ~MerchantAlias.merchants.any() is high level ORM.
-    # For async delete, we typically use the Core style delete or select then delete.
-
-    # Let's try to find them first then delete, or use a DELETE statement with WHERE NOT EXISTS.
-
-    # Subquery for merchants referencing the alias
-    stmt = (
-        delete(MerchantAlias)
-        .where(MerchantAlias.user_id == user_id)
-        .where(~MerchantAlias.merchants.any())
-        .execution_options(synchronize_session=False)
-    )
-
-    # Note: .any() with async session/delete might be tricky depending on driver support for subqueries in delete.
-    # Safe approach: select UUIDs to delete first.
-
-    select_stmt = (
-        select(MerchantAlias.id)
-        .filter(MerchantAlias.user_id == user_id)
-        .filter(~MerchantAlias.merchants.any())
-    )
-
-    result = await db.execute(select_stmt)
-    ids_to_delete = result.scalars().all()
-
-    if ids_to_delete:
-        await db.execute(
-            delete(MerchantAlias).where(MerchantAlias.id.in_(ids_to_delete))
-        )
-        await db.commit()
-        logging.info(
-            f"Limpeza automática: {len(ids_to_delete)} aliases vazios removidos para o usuário {user_id}"
-        )
-
-
 async def append_merchant_to_alias(
-    current_user: TokenData, db: AsyncSession, alias_id: UUID, merchant_id: UUID
+    current_user: TokenData,
+    db: AsyncSession,
+    alias_id: UUID,
+    merchant_id: UUID,
 ) -> MerchantAlias:
-    result = await db.execute(
-        select(MerchantAlias).filter(MerchantAlias.id == alias_id)
-    )
-    alias = result.scalars().first()
-    if not alias:
-        raise MerchantAliasNotFoundError(alias_id)
+    user_id = current_user.get_uuid()
+    alias = await get_alias_by_id(current_user, db, alias_id)
 
+    # Reatribui direto no banco: nenhuma linha retornada = merchant inexistente
     result_merchant = await db.execute(
-        select(Merchant).filter(Merchant.id == merchant_id)
+        update(Merchant)
+        .where(Merchant.id == merchant_id, Merchant.user_id == user_id)
+        .values(merchant_alias_id=alias_id)
+        .returning(Merchant)
     )
-    new_merchant_to_append = result_merchant.scalars().first()
+    appended_merchant = result_merchant.scalar_one_or_none()
 
-    if not new_merchant_to_append:
+    if not appended_merchant:
         raise MerchantNotFoundError(merchant_id)
 
-    new_merchant_to_append.merchant_alias_id = alias_id
-
     await db.commit()
-    logging.info(
-        f"Merchant {merchant_id} adicionado ao alias {alias_id} pelo usuário {current_user.get_uuid()}"
+    logger.info(
+        "Merchant %s adicionado ao alias %s pelo usuário %s",
+        merchant_id,
+        alias_id,
+        user_id,
     )
-    await _cleanup_empty_aliases(db, current_user.get_uuid())
-    await db.refresh(alias)
+
+    # Atualiza a coleção já carregada em vez de um refresh do alias
+    if appended_merchant not in alias.merchants:
+        set_committed_value(alias, "merchants", [*alias.merchants, appended_merchant])
     return alias
 
 
@@ -161,20 +196,23 @@ async def update_merchant_alias(
     alias_id: UUID,
     alias_update: model.MerchantAliasUpdate,
 ) -> MerchantAlias:
+    user_id = current_user.get_uuid()
     alias = await get_alias_by_id(current_user, db, alias_id)
 
     if alias_update.pattern is not None:
         # Check uniqueness if pattern changes
         if alias.pattern != alias_update.pattern:
-            result = await db.execute(
-                select(MerchantAlias)
-                .filter(MerchantAlias.user_id == current_user.get_uuid())
-                .filter(MerchantAlias.pattern == alias_update.pattern)
+            pattern_taken = await db.scalar(
+                select(
+                    exists().where(
+                        MerchantAlias.user_id == user_id,
+                        MerchantAlias.pattern == alias_update.pattern,
+                    )
+                )
             )
-            existing = result.scalars().first()
-            if existing:
+            if pattern_taken:
                 message = f"Já existe um alias com o nome '{alias_update.pattern}'."
-                logging.error(message)
+                logger.error(message)
                 raise MerchantAliasCreationError(message)
 
             alias.pattern = alias_update.pattern
@@ -187,106 +225,151 @@ async def update_merchant_alias(
             update(Merchant)
             .where(
                 Merchant.merchant_alias_id == alias_id,
-                Merchant.user_id == current_user.get_uuid(),
+                Merchant.user_id == user_id,
             )
             .values(category_id=alias_update.category_id)
         )
 
+        # Batch update existing payments if user requested override. Roda na
+        # mesma transação, com os merchants já carregados por get_alias_by_id
+        if alias_update.update_past_transactions and alias.merchant_ids:
+            await update_transactions_category_bulk(
+                db,
+                user_id,
+                alias.merchant_ids,
+                alias_update.category_id,
+                commit=False,
+            )
+
     if alias_update.is_investment is not None:
         alias.is_investment = alias_update.is_investment
 
     if alias_update.ignored is not None:
         alias.ignored = alias_update.ignored
 
+    # Um único commit para alias, merchants e transações; como a sessão não
+    # expira objetos no commit, o refresh do alias é desnecessário
     await db.commit()
-    await db.refresh(alias)
-
-    # Batch update existing payments if category changed, is present, and user requested override
-    if alias_update.category_id is not None and alias_update.update_past_transactions:
-        # Fetch merchants belonging to this alias
-        # We need to await the relationship loading or query manually since it's lazy by default (and async relies on selectin load or explicit join)
-        # Easier to query IDs manually.
-        result_merchants = await db.execute(
-            select(Merchant.id).where(Merchant.merchant_alias_id == alias_id)
-        )
-        merchant_ids = result_merchants.scalars().all()
 
-        if merchant_ids:
-            await update_transactions_category_bulk(
-                db, current_user.get_uuid(), merchant_ids, alias.category_id
-            )
-
-    logging.info(
-        f"Alias {alias.pattern} atualizado pelo usuário {current_user.get_uuid()}"
-    )
+    logger.info("Alias %s atualizado pelo usuário %s", alias.pattern, user_id)
     return alias
 
 
 async def remove_merchant_from_alias(
-    current_user: TokenData, db: AsyncSession, alias_id: UUID, merchant_id: UUID
+    current_user: TokenData,
+    db: AsyncSession,
+    alias_id: UUID,
+    merchant_id: UUID,
 ) -> None:
-    result_alias = await db.execute(
-        select(MerchantAlias).filter(MerchantAlias.id == alias_id)
-    )
-    alias = result_alias.scalars().first()
-    if not alias:
-        raise MerchantAliasNotFoundError(alias_id)
+    user_id = current_user.get_uuid()
 
-    result_merchant = await db.execute(
-        select(Merchant).filter(Merchant.id == merchant_id)
+    # Alias e merchant validados em uma única consulta (LEFT JOIN no merchant)
+    result = await db.execute(
+        select(MerchantAlias.id, Merchant.id, Merchant.name, Merchant.merchant_alias_id)
+        .outerjoin(
+            Merchant, and_(Merchant.id == merchant_id, Merchant.user_id == user_id)
+        )
+        .filter(MerchantAlias.id == alias_id, MerchantAlias.user_id == user_id)
     )
-    merchant_to_remove = result_merchant.scalars().first()
+    row = result.first()
+    if not row:
+        raise MerchantAliasNotFoundError(alias_id)
 
-    if not merchant_to_remove:
+    _, found_merchant_id, merchant_name, current_alias_id = row
+    if not found_merchant_id:
         raise MerchantNotFoundError(merchant_id)
 
-    if merchant_to_remove.merchant_alias_id != alias_id:
+    if current_alias_id != alias_id:
         raise MerchantNotBelongToAliasError(alias_id, merchant_id)
 
-    if merchant_to_remove.merchant_alias_id == alias_id:
-        # Create a dedicated alias for the removed merchant (or reuse existing matching its name)
-        # preventing it from being null/orphaned
-        target_pattern = merchant_to_remove.name
+    # Create a dedicated alias for the removed merchant (or reuse existing matching its name)
+    # preventing it from being null/orphaned. O upsert em (user_id, pattern)
+    # resolve o "busca ou cria" em um único INSERT ... ON CONFLICT ... RETURNING.
+    target_pattern = merchant_name
+    upsert_stmt = insert(MerchantAlias).values(
+        id=uuid7(), user_id=user_id, pattern=target_pattern
+    )
+    upsert_stmt = upsert_stmt.on_conflict_do_update(
+        index_elements=["user_id", "pattern"],
+        set_={"pattern": upsert_stmt.excluded.pattern},
+    ).returning(MerchantAlias.id)
+    target_alias_id = (await db.execute(upsert_stmt)).scalar_one()
+
+    await db.execute(
+        update(Merchant)
+        .where(Merchant.id == merchant_id)
+        .values(merchant_alias_id=target_alias_id)
+    )
 
-        result_existing = await db.execute(
-            select(MerchantAlias).filter(
-                MerchantAlias.user_id == current_user.get_uuid(),
-                MerchantAlias.pattern == target_pattern,
-            )
-        )
-        existing_target_alias = result_existing.scalars().first()
-
-        if existing_target_alias and existing_target_alias.id != alias_id:
-            target_alias_id = existing_target_alias.id
-        else:
-            new_alias_id = uuid4()
-            new_alias = MerchantAlias(
-                id=new_alias_id,
-                user_id=current_user.get_uuid(),
-                pattern=target_pattern,
-            )
-            db.add(new_alias)
-            await db.flush()
-            target_alias_id = new_alias_id
+    await db.commit()
+    logger.info(
+        "Merchant %s movido do alias %s para alias %s (%s)",
+        merchant_id,
+        alias_id,
+        target_alias_id,
+        target_pattern,
+    )
 
-        merchant_to_remove.merchant_alias_id = target_alias_id
-        await db.commit()
-        logging.info(
-            f"Merchant {merchant_id} movido do alias {alias_id} para alias {target_alias_id} ({target_pattern})"
-        )
-        await _cleanup_empty_aliases(db, current_user.get_uuid())
 
+# Filtros de cada escopo montados uma única vez (escopo desconhecido = sem filtro)
+_SCOPE_FILTERS = {
+    "general": (
+        MerchantAlias.is_investment.is_(False),
+        MerchantAlias.ignored.is_(False),
+    ),
+    "investment": (MerchantAlias.is_investment.is_(True),),
+    "ignored": (MerchantAlias.ignored.is_(True),),
+}
 
-async def _apply_scope_filter(query, scope: str):
-    if scope == "general":
-        return query.filter(
-            MerchantAlias.is_investment == False, MerchantAlias.ignored == False
-        )
-    elif scope == "investment":
-        return query.filter(MerchantAlias.is_investment == True)
-    elif scope == "ignored":
-        return query.filter(MerchantAlias.ignored == True)
-    return query
+
+def _with_alias_filters(stmt, user_id: UUID, scope: str, search: str | None):
+    """Aplica usuário, busca e escopo a um ``lambda_stmt`` de aliases."""
+    stmt += lambda s: s.filter(MerchantAlias.user_id == user_id)
+    if search is not None:
+        stmt += lambda s: s.filter(MerchantAlias.pattern.ilike(search, escape="\\"))
+    scope_filters = _SCOPE_FILTERS.get(scope, ())
+    stmt += lambda s: s.filter(*scope_filters)
+    return stmt
+
+
+async def _fetch_alias_page(
+    db: AsyncSession,
+    user_id: UUID,
+    scope: str,
+    page: int,
+    size: int,
+    search: str | None = None,
+):
+    """
+    Retorna ``(items, total)`` de uma página de aliases. O total vem junto das
+    linhas via ``count(*) OVER ()``, evitando um SELECT count(*) separado.
+    As consultas são ``lambda_stmt``: a árvore SQL e sua compilação ficam em
+    cache, e a cada chamada só os parâmetros são extraídos.
+    """
+    offset = (page - 1) * size
+    page_stmt = lambda_stmt(
+        lambda: select(MerchantAlias, func.count().over().label("total"))
+    )
+    page_stmt = _with_alias_filters(page_stmt, user_id, scope, search)
+    # A listagem só expõe merchant_ids: carrega apenas o id dos merchants em vez
+    # de hidratar cada Merchant por completo na identity map
+    page_stmt += lambda s: (
+        s.options(selectinload(MerchantAlias.merchants).load_only(Merchant.id))
+        .order_by(MerchantAlias.pattern)
+        .offset(offset)
+        .limit(size)
+    )
+
+    rows = (await db.execute(page_stmt)).all()
+    if rows:
+        return [row[0] for row in rows], rows[0].total
+    if page == 1:
+        return [], 0
+
+    # Página além da última: sem linhas não há total, então conta à parte
+    count_stmt = lambda_stmt(lambda: select(func.count()).select_from(MerchantAlias))
+    count_stmt = _with_alias_filters(count_stmt, user_id, scope, search)
+    return [], (await db.execute(count_stmt)).scalar_one()
 
 
 async def get_merchant_aliases(
@@ -296,28 +379,11 @@ async def get_merchant_aliases(
     size: int = 20,
     scope: str = "general",
 ) -> PaginatedResponse[model.MerchantAliasResponse]:
+    user_id = current_user.get_uuid()
     page = max(1, page)
     size = max(1, size)
 
-    query = select(MerchantAlias).filter(
-        MerchantAlias.user_id == current_user.get_uuid()
-    )
-
-    query = await _apply_scope_filter(query, scope)
-
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
-
-    items_query = (
-        query.options(selectinload(MerchantAlias.merchants))
-        .order_by(MerchantAlias.pattern)
-        .offset((page - 1) * size)
-        .limit(size)
-    )
-
-    items_result = await db.execute(items_query)
-    items = items_result.scalars().all()
+    items, total = await _fetch_alias_page(db, user_id, scope, page, size)
 
     return PaginatedResponse.create(items, total, page, size)
 
@@ -325,13 +391,18 @@ async def get_merchant_aliases(
 async def get_alias_by_id(
     current_user: TokenData, db: AsyncSession, alias_id: UUID
 ) -> MerchantAlias:
+    user_id = current_user.get_uuid()
+    # lambda_stmt: a consulta é montada e compilada uma vez; alias_id e
+    # user_id são extraídos como parâmetros a cada chamada
     result = await db.execute(
-        select(MerchantAlias)
-        .options(selectinload(MerchantAlias.merchants))
-        .filter(MerchantAlias.id == alias_id)
-        .filter(MerchantAlias.user_id == current_user.get_uuid())
+        lambda_stmt(
+            lambda: select(MerchantAlias)
+            .options(selectinload(MerchantAlias.merchants))
+            .filter(MerchantAlias.id == alias_id)
+            .filter(MerchantAlias.user_id == user_id)
+        )
     )
-    alias = result.scalars().first()
+    alias = result.scalar_one_or_none()
 
     if not alias:
         raise MerchantAliasNotFoundError(alias_id)
@@ -346,32 +417,15 @@ async def search_merchants_by_alias(
     size: int = 20,
     scope: str = "general",
 ) -> PaginatedResponse[model.MerchantAliasResponse]:
+    user_id = current_user.get_uuid()
     page = max(1, page)
     size = max(1, size)
 
-    base_query = (
-        select(MerchantAlias)
-        .filter(MerchantAlias.user_id == current_user.get_uuid())
-        .filter(MerchantAlias.pattern.ilike(f"%{query}%"))
+    items, total = await _fetch_alias_page(
+        db, user_id, scope, page, size, search=contains_pattern(query)
     )
 
-    base_query = await _apply_scope_filter(base_query, scope)
-
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
-
-    items_query = (
-        base_query.options(selectinload(MerchantAlias.merchants))
-        .order_by(MerchantAlias.pattern)
-        .offset((page - 1) * size)
-        .limit(size)
-    )
-
-    items_result = await db.execute(items_query)
-    items = items_result.scalars().all()
-
-    logging.info(
-        f"Buscando aliases com query '{query}' pelo usuário {current_user.get_uuid()} (paginado)"
+    logger.info(
+        "Buscando aliases com query '%s' pelo usuário %s (paginado)", query, user_id
     )
     return PaginatedResponse.create(items, total, page, size)
@@ -1,4 +1,5 @@
-from typing import Annotated
+from typing import Annotated, List, Tuple
+from uuid import UUID
 from fastapi import APIRouter, Depends, Request, Response
 from starlette import status
 from . import model
@@ -9,7 +10,6 @@ from ..rate_limiting import limiter
 from ..entities.user import User
 from ..exceptions.auth import AuthenticationError
 from logging import getLogger
-from sqlalchemy.future import select
 
 logger = getLogger(__name__)
 
@@ -110,20 +110,14 @@ async def refresh_token(
 
 @router.get("/me", response_model=model.User)
 async def get_current_user(
-    user: Annotated[User, Depends(service.get_current_user_from_db)],
-    db: DbSession,
+    user_with_items: Annotated[
+        Tuple[User, List[UUID]], Depends(service.get_current_user_with_item_ids)
+    ],
 ):
-    # Agora usa depends do service.get_current_user_from_db que já retorna o User validado
-
-    from ..entities.open_finance_item import OpenFinanceItem
+    # Usuário e IDs dos items de Open Finance vêm de uma única consulta
+    user, item_ids = user_with_items
 
-    result = await db.execute(
-        select(OpenFinanceItem).filter(OpenFinanceItem.user_id == user.id)
-    )
-    items = result.scalars().all()
-    item_ids = [item.id for item in items]
-
-    return model.User(
+    current_user = model.User(
         id=user.id,
         email=user.email,
         first_name=user.first_name,
@@ -132,6 +126,12 @@ async def get_current_user(
         is_admin=user.is_admin,
         item_ids=item_ids,
     )
+    # O model já está validado: serializa direto para JSON no pydantic-core em
+    # vez de revalidar via response_model e passar pelo json da stdlib
+    return Response(
+        content=current_user.model_dump_json(by_alias=True),
+        media_type="application/json",
+    )
 
 
 @router.post("/logout")
@@ -1,7 +1,13 @@
+from functools import cached_property
 from uuid import UUID
-from pydantic import EmailStr, BaseModel, field_validator
+from pydantic import BaseModel, field_validator
 from src.schemas.base import CamelModel
+from src.schemas.types import EmailStr
 from typing import List
+from src.config import settings
+
+# Lido uma vez no import em vez de a cada validação de usuário
+_API_BASE_URL = settings.API_BASE_URL
 
 
 class RegisterUserRequest(CamelModel):
@@ -24,9 +30,7 @@ class User(CamelModel):
     @classmethod
     def add_base_url(cls, v: str | None) -> str | None:
         if v and v.startswith("/"):
-            from src.config import settings
-
-            return f"{settings.API_BASE_URL}{v}"
+            return f"{_API_BASE_URL}{v}"
         return v
 
 
@@ -38,6 +42,13 @@ class Token(BaseModel):
 class TokenData(CamelModel):
     user_id: str | None = None
 
-    def get_uuid(self) -> UUID | None:
+    @cached_property
+    def user_uuid(self) -> UUID | None:
+        # Convertido uma única vez por token (o TokenData é reaproveitado
+        # pelo cache de tokens entre requisições)
         if self.user_id:
             return UUID(self.user_id)
+        return None
+
+    def get_uuid(self) -> UUID | None:
+        return self.user_uuid
@@ -1,23 +1,32 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime, timezone
-from typing import Annotated, Tuple, Dict, Any
-from uuid import UUID, uuid4
+from typing import Annotated, Tuple, Dict, Any, List
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from passlib.context import CryptContext
+from cachetools import cached
 import jwt
 from jwt import PyJWTError, ExpiredSignatureError, InvalidTokenError
 from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from src.entities.user import User
+from src.entities.open_finance_item import OpenFinanceItem
 from . import model
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from ..exceptions.auth import AuthenticationError
 from ..database.core import get_db
+from ..utils.cache import token_data_cache, token_data_cache_lock
+from ..utils.ids import uuid7
 import logging
 import os
+import secrets
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
+# Codificada uma vez: o PyJWT converteria a str para bytes a cada encode/decode
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8") if SECRET_KEY else None
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 30
 EXPIRE_MINUTES = 15
@@ -25,6 +34,15 @@ EXPIRE_MINUTES = 15
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/login")
 bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt é CPU-bound (~200ms por operação) e libera o GIL: roda fora do event
+# loop para não travar as demais requisições durante um login
+_password_hash_pool = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="password-hash"
+)
+# Hash de uma senha qualquer, verificado quando o email não existe para que a
+# resposta leve o mesmo tempo que uma senha errada (evita enumerar emails)
+_DUMMY_PASSWORD_HASH = "$2b$12$NKfwbtn7WInh9Dj.qMZVkuqDV.Xq2C2LTSkrFjCzj3CR0SFzQEvqy"
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt_context.verify(plain_password, hashed_password)
@@ -34,28 +52,49 @@ def get_password_hash(password: str) -> str:
     return bcrypt_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_hash_pool, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_hash_pool, get_password_hash, password)
+
+
 async def authenticate_user(email: str, password: str, db: AsyncSession) -> User | bool:
     result = await db.execute(select(User).filter(User.email == email))
     user = result.scalars().first()
-    if not user or not verify_password(password, user.password_hash):
+    hashed_password = user.password_hash if user else _DUMMY_PASSWORD_HASH
+    password_ok = await verify_password_async(password, hashed_password)
+    if not user or not password_ok:
         logging.warning(f"Falha na autenticação para o email: {email}")
         return False
     return user
 
 
-def create_access_token(
-    email: str,
-    user_id: UUID,
-    expires_delta: timedelta = timedelta(minutes=EXPIRE_MINUTES),
+def _create_token(
+    email: str, user_id: UUID, token_type: str, expires_delta: timedelta
 ) -> str:
     encode = {
         "sub": email,
         "id": str(user_id),
-        "type": "access",
+        "type": token_type,
         "exp": datetime.now(timezone.utc) + expires_delta,
-        "jti": str(uuid4()),
+        # 128 bits aleatórios em base64url: mais curto que o UUID formatado
+        "jti": secrets.token_urlsafe(16),
     }
-    return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(encode, _SECRET_KEY_BYTES, algorithm=ALGORITHM)
+
+
+def create_access_token(
+    email: str,
+    user_id: UUID,
+    expires_delta: timedelta = timedelta(minutes=EXPIRE_MINUTES),
+) -> str:
+    return _create_token(email, user_id, "access", expires_delta)
 
 
 def create_refresh_token(
@@ -63,21 +102,24 @@ def create_refresh_token(
     user_id: UUID,
     expires_delta: timedelta = timedelta(minutes=EXPIRE_MINUTES),
 ) -> str:
-    encode = {
-        "sub": email,
-        "id": str(user_id),
-        "type": "refresh",
-        "exp": datetime.now(timezone.utc) + expires_delta,
-        "jti": str(uuid4()),
-    }
-    return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
+    return _create_token(email, user_id, "refresh", expires_delta)
+
+
+@cached(cache=token_data_cache, lock=token_data_cache_lock)
+def _decode_token(token: str) -> Tuple[model.TokenData, float]:
+    """
+    Decodifica o JWT e retorna (TokenData, exp). Tokens válidos ficam em cache
+    até o menor entre TOKEN_CACHE_TTL e o próprio "exp"; erros não são cacheados.
+    """
+    payload = jwt.decode(token, _SECRET_KEY_BYTES, algorithms=[ALGORITHM])
+    user_id: str = payload.get("id")
+    return model.TokenData(user_id=user_id), payload.get("exp", 0)
 
 
 def verify_token(token: str) -> model.TokenData:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("id")
-        return model.TokenData(user_id=user_id)
+        token_data, _ = _decode_token(token)
+        return token_data
     except ExpiredSignatureError:
         raise AuthenticationError(message="Token expirado")
     except InvalidTokenError:
@@ -89,7 +131,7 @@ def verify_token(token: str) -> model.TokenData:
 
 def verify_refresh_token(token: str) -> model.TokenData:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, _SECRET_KEY_BYTES, algorithms=[ALGORITHM])
         if payload.get("type") != "refresh":
             raise InvalidTokenError("Invalid token type")
 
@@ -111,11 +153,11 @@ async def register_user(
             is_admin = True
 
         create_user_model = User(
-            id=uuid4(),
+            id=uuid7(),
             email=register_user_request.email,
             first_name=register_user_request.first_name,
             last_name=register_user_request.last_name,
-            password_hash=get_password_hash(register_user_request.password),
+            password_hash=await get_password_hash_async(register_user_request.password),
             is_admin=is_admin,
         )
         db.add(create_user_model)
@@ -143,6 +185,26 @@ async def get_current_user_from_db(
     return user
 
 
+async def get_current_user_with_item_ids(
+    token: Annotated[str, Depends(oauth2_bearer)], db: AsyncSession = Depends(get_db)
+) -> Tuple[User, List[UUID]]:
+    """
+    Como ``get_current_user_from_db``, mas já traz os IDs dos items de Open
+    Finance do usuário na mesma consulta (uma linha por item, via LEFT JOIN).
+    """
+    token_data = verify_token(token)
+    result = await db.execute(
+        select(User, OpenFinanceItem.id)
+        .outerjoin(OpenFinanceItem, OpenFinanceItem.user_id == User.id)
+        .filter(User.id == token_data.get_uuid())
+    )
+    rows = result.all()
+    if not rows:
+        raise AuthenticationError(message="User not found")
+    item_ids = [item_id for _, item_id in rows if item_id is not None]
+    return rows[0][0], item_ids
+
+
 async def get_current_admin(user: User = Depends(get_current_user_from_db)) -> User:
     if not user.is_admin:
         raise HTTPException(
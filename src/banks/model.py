@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
-from pydantic import constr
+from src.schemas.types import HexColor
 from src.schemas.base import CamelModel
 
 
@@ -9,7 +9,7 @@ class BankBase(CamelModel):
     name: str
     slug: Optional[str] = None
     logo_url: str
-    color_hex: constr(pattern=r"^#[0-9A-Fa-f]{6}$")
+    color_hex: HexColor
 
 
 class BankCreate(BankBase):
@@ -20,7 +20,7 @@ class BankUpdate(CamelModel):
     name: Optional[str] = None
     is_active: Optional[bool] = None
     logo_url: Optional[str] = None
-    color_hex: Optional[constr(pattern=r"^#[0-9A-Fa-f]{6}$")] = None
+    color_hex: Optional[HexColor] = None
 
 
 class BankResponse(BankBase):
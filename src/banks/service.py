@@ -1,15 +1,36 @@
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import delete, update
+from sqlalchemy.orm import load_only, raiseload
 from sqlalchemy.exc import IntegrityError
-from psycopg2.errors import UniqueViolation
+from ..database.errors import is_unique_violation
 from . import model
 from ..entities.bank import Bank
-from ..exceptions.banks import BankCreationError, BankNotFoundError
+from ..exceptions.banks import BankCreationError, BankNotFoundError, BankUpdateError
 import logging
-from slugify import slugify
+from ..utils.slug import slugify
 
 from ..auth.model import TokenData
+from ..utils.cache import bank_list_cache, invalidate_bank_cache
+
+logger = logging.getLogger(__name__)
+
+# Leituras carregam só as colunas do BankResponse (ispb/connector_id ficam de
+# fora) e falham alto se algum lazy load aparecer na serialização
+_BANK_READ_OPTIONS = (
+    load_only(
+        Bank.id,
+        Bank.name,
+        Bank.slug,
+        Bank.logo_url,
+        Bank.color_hex,
+        Bank.is_active,
+        Bank.created_at,
+        Bank.updated_at,
+    ),
+    raiseload("*"),
+)
 
 
 async def create_bank(
@@ -21,13 +42,16 @@ async def create_bank(
         db.add(new_bank)
         await db.commit()
         await db.refresh(new_bank)
-        logging.info(
-            f"Novo banco registrado: {new_bank.name} pelo usuário {current_user.get_uuid()}"
+        invalidate_bank_cache()
+        logger.info(
+            "Novo banco registrado: %s pelo usuário %s",
+            new_bank.name,
+            current_user.get_uuid(),
         )
         return new_bank
     except IntegrityError as e:
-        logging.error(f"Falha na criação de banco: {bank.name}")
-        if isinstance(e.orig, UniqueViolation):
+        logger.error("Falha na criação de banco: %s", bank.name)
+        if is_unique_violation(e):
             raise BankCreationError(f"Já existe um banco com o nome {bank.name}.")
         raise BankCreationError(str(e.orig))
 
@@ -35,24 +59,30 @@ async def create_bank(
 async def get_banks(
     current_user: TokenData, db: AsyncSession
 ) -> list[model.BankResponse]:
-    result = await db.execute(select(Bank))
-    banks = result.scalars().all()
-    logging.info(f"Recuperado todos os bancos pelo usuário {current_user.get_uuid()}")
+    # A lista é a mesma para todos os usuários: cacheada já no schema de resposta
+    banks = bank_list_cache.get(())
+    if banks is None:
+        result = await db.execute(select(Bank).options(*_BANK_READ_OPTIONS))
+        banks = [model.BankResponse.model_validate(b) for b in result.scalars()]
+        bank_list_cache[()] = banks
+    logger.info("Recuperado todos os bancos pelo usuário %s", current_user.get_uuid())
     return banks
 
 
 async def get_bank_by_id(
     current_user: TokenData, db: AsyncSession, bank_id: UUID
 ) -> Bank:
-    result = await db.execute(select(Bank).filter(Bank.id == bank_id))
-    bank = result.scalars().first()
+    # Busca pela PK: devolve direto do identity map se o banco já está na sessão
+    bank = await db.get(Bank, bank_id, options=_BANK_READ_OPTIONS)
     if not bank:
-        logging.warning(
-            f"Banco de ID {bank_id} não encontrado pelo usuário {current_user.get_uuid()}"
+        logger.warning(
+            "Banco de ID %s não encontrado pelo usuário %s",
+            bank_id,
+            current_user.get_uuid(),
         )
         raise BankNotFoundError(bank_id)
-    logging.info(
-        f"Banco de ID {bank_id} recuperado pelo usuário {current_user.get_uuid()}"
+    logger.info(
+        "Banco de ID %s recuperado pelo usuário %s", bank_id, current_user.get_uuid()
     )
     return bank
 
@@ -63,24 +93,55 @@ async def update_bank(
     bank_id: UUID,
     bank_update: model.BankUpdate,
 ) -> Bank:
-    bank = await get_bank_by_id(current_user, db, bank_id)
-
     bank_data = bank_update.model_dump(exclude_unset=True)
-    bank_data["slug"] = slugify(bank_update.name)
+    # Todas as colunas editáveis são NOT NULL: um null explícito viraria
+    # IntegrityError no UPDATE
+    null_fields = [field for field, value in bank_data.items() if value is None]
+    if null_fields:
+        raise BankUpdateError(f"Campos não podem ser nulos: {', '.join(null_fields)}")
 
-    for key, value in bank_data.items():
-        setattr(bank, key, value)
+    # Slug só é recalculado quando o nome vem no payload
+    if "name" in bank_data:
+        bank_data["slug"] = slugify(bank_data["name"])
+
+    if not bank_data:
+        return await get_bank_by_id(current_user, db, bank_id)
+
+    # UPDATE ... RETURNING: busca e atualização no mesmo statement
+    result = await db.execute(
+        update(Bank)
+        .where(Bank.id == bank_id)
+        .values(**bank_data)
+        .returning(Bank)
+        .execution_options(populate_existing=True)
+    )
+    bank = result.scalar_one_or_none()
+    if not bank:
+        logger.warning(
+            "Banco de ID %s não encontrado pelo usuário %s",
+            bank_id,
+            current_user.get_uuid(),
+        )
+        raise BankNotFoundError(bank_id)
 
     await db.commit()
-    await db.refresh(bank)
-    logging.info(f"Banco atualizado com sucesso pelo usuário {current_user.get_uuid()}")
+    invalidate_bank_cache()
+    logger.info("Banco atualizado com sucesso pelo usuário %s", current_user.get_uuid())
     return bank
 
 
 async def delete_bank(current_user: TokenData, db: AsyncSession, bank_id: UUID) -> None:
-    bank = await get_bank_by_id(current_user, db, bank_id)
-    await db.delete(bank)
+    result = await db.execute(delete(Bank).where(Bank.id == bank_id).returning(Bank.id))
+    if result.scalar_one_or_none() is None:
+        logger.warning(
+            "Banco de ID %s não encontrado pelo usuário %s",
+            bank_id,
+            current_user.get_uuid(),
+        )
+        raise BankNotFoundError(bank_id)
+
     await db.commit()
-    logging.info(
-        f"Banco de ID {bank_id} foi excluído pelo usuário {current_user.get_uuid()}"
+    invalidate_bank_cache()
+    logger.info(
+        "Banco de ID %s foi excluído pelo usuário %s", bank_id, current_user.get_uuid()
     )
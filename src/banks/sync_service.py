@@ -4,11 +4,15 @@ from typing import Dict, List, Any, Optional
 from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 
 from src.entities.bank import Bank
 from src.open_finance.client import client as pluggy_client
+from src.utils.cache import invalidate_bank_cache
+from src.utils.slug import slugify
 
 logger = logging.getLogger(__name__)
 
@@ -20,14 +24,48 @@ async def sync_banks(db: AsyncSession):
     """
     logger.info("Starting bank synchronization with Pluggy...")
 
+    # Todos os bancos carregados de uma vez; o casamento com os connectors é
+    # feito em memória em vez de até 3 SELECTs por connector. A query roda
+    # enquanto a chamada HTTP à Pluggy está em andamento na thread do executor.
+    loop = asyncio.get_running_loop()
+    # Connectors in Pluggy represent Banks/Institutions
+    # Only banks with TRANSACTIONS product
+    connectors_future = loop.run_in_executor(
+        None, pluggy_client.get_connectors, "TRANSACTIONS"
+    )
     try:
-        # Connectors in Pluggy represent Banks/Institutions
-        loop = asyncio.get_running_loop()
-        connectors = await loop.run_in_executor(None, pluggy_client.get_connectors)
+        result = await db.execute(select(Bank))
+    except Exception:
+        # Não deixa a exceção da chamada HTTP órfã quando a query falha
+        connectors_future.add_done_callback(lambda f: f.exception())
+        raise
+
+    try:
+        connectors = await connectors_future
     except Exception as e:
         logger.error(f"Failed to fetch connectors from Pluggy: {e}")
         raise e
 
+    # Cada banco vira a linha que será gravada no upsert final
+    rows = [
+        {
+            "id": b.id,
+            "connector_id": b.connector_id,
+            "name": b.name,
+            "slug": b.slug,
+            "is_active": b.is_active,
+            "logo_url": b.logo_url,
+            "color_hex": b.color_hex,
+        }
+        for b in result.scalars().all()
+    ]
+    rows_by_connector_id = {r["connector_id"]: r for r in rows if r["connector_id"]}
+    rows_by_name = {r["name"]: r for r in rows}
+    rows_by_lower_name = {r["name"].lower(): r for r in rows}
+    # Linhas tocadas pelo sync, por id (um banco casado por dois connectors
+    # entra uma vez só, com os dados do último, como no loop sequencial)
+    changed_rows: Dict[Any, Dict[str, Any]] = {}
+
     for connector in connectors:
         connector_id = connector.get("id")
         name = connector.get("name")
@@ -45,61 +83,70 @@ async def sync_banks(db: AsyncSession):
         if not connector_id or not name:
             continue
 
-        # Filter: Only banks with TRANSACTIONS product
-        products = connector.get("products", [])
-        if "TRANSACTIONS" not in products:
-            continue
-
         # 1. Try to find by Connector ID (Best match)
-        result = await db.execute(
-            select(Bank).filter(Bank.connector_id == connector_id)
-        )
-        bank = result.scalars().first()
+        row = rows_by_connector_id.get(connector_id)
 
         # 2. If not found by ID, try to find by Name (Legacy/Manual banks)
-        if not bank:
-            # Exact match first (case sensitive? usually names are standard)
-            result = await db.execute(select(Bank).filter(Bank.name == name))
-            bank = result.scalars().first()
-
-            if not bank:
-                # Case-insensitive match to avoid "Nubank" vs "nubank" duplicates
-                result = await db.execute(select(Bank).filter(Bank.name.ilike(name)))
-                bank = result.scalars().first()
+        if not row:
+            # Exact match first, then case-insensitive to avoid
+            # "Nubank" vs "nubank" duplicates
+            row = rows_by_name.get(name) or rows_by_lower_name.get(name.lower())
 
             # Note: Removed fuzzy partial matches (like '%itaú%') to avoid
             # linking "Itaú Corretora" to "Itaú" incorrectly.
             # We strictly trust ID or exact Name.
 
-        # Slug generation
-        slug = name.lower().replace(" ", "-").replace(".", "")
-
-        if bank:
+        if row:
             # Update existing bank with Pluggy data
-            bank.connector_id = connector_id
-            bank.name = name
-            bank.is_active = True  # Re-activate if it was found in Pluggy
+            row["connector_id"] = connector_id
+            row["name"] = name
+            row["is_active"] = True  # Re-activate if it was found in Pluggy
             if image_url:
-                bank.logo_url = image_url
+                row["logo_url"] = image_url
 
             # Update colors
-            bank.color_hex = color_hex
+            row["color_hex"] = color_hex
         else:
             # Create new Bank
-            bank = Bank(
-                id=uuid4(),
-                connector_id=connector_id,
-                name=name,
-                slug=slug,
-                is_active=True,
-                logo_url=image_url or "",
-                color_hex=color_hex,
-            )
-            db.add(bank)
-            await db.flush()  # Ensure subsequent iterations see this new bank (prevent dup name)
+            row = {
+                "id": uuid4(),
+                "connector_id": connector_id,
+                "name": name,
+                "slug": slugify(name),
+                "is_active": True,
+                "logo_url": image_url or "",
+                "color_hex": color_hex,
+            }
+
+        # Subsequent iterations see new/renamed banks (prevent dup name)
+        changed_rows[row["id"]] = row
+        rows_by_connector_id[connector_id] = row
+        rows_by_name[name] = row
+        rows_by_lower_name[name.lower()] = row
+
+    if not changed_rows:
+        logger.info("Nenhum banco para sincronizar.")
+        return
+
+    # Um único INSERT ... ON CONFLICT (id) DO UPDATE para todos os bancos;
+    # populate_existing atualiza os Bank já presentes na sessão
+    stmt = insert(Bank).values(list(changed_rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={
+            "connector_id": stmt.excluded.connector_id,
+            "name": stmt.excluded.name,
+            "is_active": stmt.excluded.is_active,
+            "logo_url": stmt.excluded.logo_url,
+            "color_hex": stmt.excluded.color_hex,
+            "updated_at": func.now(),
+        },
+    )
 
     try:
+        await db.execute(stmt.returning(Bank).execution_options(populate_existing=True))
         await db.commit()
+        invalidate_bank_cache()
         logger.info("Sincronização de bancos concluída com sucesso.")
     except IntegrityError as e:
         await db.rollback()
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, status, Query
+from fastapi import APIRouter, status, Query, Response
+from pydantic import TypeAdapter
 from typing import List
 from uuid import UUID
 
@@ -9,6 +10,8 @@ from ..auth.service import CurrentUser, CurrentAdmin
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
+_category_list_adapter = TypeAdapter(List[model.CategoryResponse])
+
 
 @router.post(
     "/", response_model=model.CategoryResponse, status_code=status.HTTP_201_CREATED
@@ -31,7 +34,13 @@ async def get_categories(
     # User requested: "Admin Panel must show Global state".
     # Assuming CurrentUser can be admin.
     # if view == "global" and not current_user.is_admin: ... (logic for another time if needed)
-    return await service.get_categories(current_user, db, view)
+    categories = await service.get_categories(current_user, db, view)
+    # A lista já sai do service como CategoryResponse: serializa direto no
+    # pydantic-core em vez de revalidar cada item via response_model
+    return Response(
+        content=_category_list_adapter.dump_json(categories, by_alias=True),
+        media_type="application/json",
+    )
 
 
 from ..schemas.pagination import PaginatedResponse
@@ -4,12 +4,12 @@ from uuid import UUID
 from src.schemas.base import CamelModel
 from decimal import Decimal
 from src.entities.category import Category
-from pydantic import constr
+from src.schemas.types import HexColor
 
 
 class CategoryBase(CamelModel):
     name: str
-    color_hex: constr(pattern=r"^#[0-9A-Fa-f]{6}$")  # Validação de cor hex
+    color_hex: HexColor  # Validação de cor hex
     is_investment: bool = False
     ignored: bool = False
 
@@ -20,14 +20,14 @@ class CategoryCreate(CategoryBase):
 
 class CategoryUpdate(CategoryBase):
     name: Optional[str] = None
-    color_hex: Optional[constr(pattern=r"^#[0-9A-Fa-f]{6}$")] = None
+    color_hex: Optional[HexColor] = None
     is_investment: Optional[bool] = None
     ignored: Optional[bool] = None
 
 
 class CategorySettingsUpdate(CamelModel):
     alias: Optional[str] = None
-    color_hex: Optional[constr(pattern=r"^#[0-9A-Fa-f]{6}$")] = None
+    color_hex: Optional[HexColor] = None
     is_investment: Optional[bool] = None
     ignored: Optional[bool] = None
 
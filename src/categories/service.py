@@ -1,10 +1,11 @@
 from datetime import datetime, timezone
 from uuid import uuid4, UUID
 from typing import List, Optional
-from sqlalchemy import func, select, or_
+from sqlalchemy import delete, func, null, select, or_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from psycopg2.errors import UniqueViolation
+from ..database.errors import is_unique_violation
 from fastapi import HTTPException, Query
 from . import model
 from ..auth.model import TokenData
@@ -12,8 +13,13 @@ from ..entities.transaction import Transaction
 from ..exceptions.categories import CategoryCreationError, CategoryNotFoundError
 import logging
 from ..entities.category import Category, UserCategorySetting
-from slugify import slugify
-from ..utils.cache import category_descendants_cache, invalidate_category_cache
+from ..utils.slug import slugify
+from ..utils.search import contains_pattern
+from ..utils.cache import (
+    category_descendants_cache,
+    category_list_cache,
+    invalidate_category_cache,
+)
 from ..schemas.pagination import PaginatedResponse
 
 logger = logging.getLogger(__name__)
@@ -38,24 +44,15 @@ async def get_category_descendants(db: AsyncSession, category_id: UUID) -> List[
 
     # Verificar se está no cache
     if cache_key in category_descendants_cache:
-        logger.debug(f"Cache HIT para category_id={category_id}")
+        logger.debug("Cache HIT para category_id=%s", category_id)
         return category_descendants_cache[cache_key]
 
     logger.debug(
-        f"Cache MISS para category_id={category_id}, consultando banco de dados"
+        "Cache MISS para category_id=%s, consultando banco de dados", category_id
     )
 
-    # Verificar se a categoria existe
-    result = await db.execute(select(Category).filter(Category.id == category_id))
-    category_exists = result.scalars().first()
-
-    if not category_exists:
-        logger.warning(f"Categoria {category_id} não encontrada no banco de dados")
-        # Retornar lista contendo apenas o ID fornecido para não quebrar a query
-        return [category_id]
-
     # CTE Recursivo: Buscar categoria + descendentes
-    # Anchor: categoria fornecida
+    # Anchor: categoria fornecida (também serve de verificação de existência)
     anchor = select(Category.id.label("category_id")).where(Category.id == category_id)
 
     cte = anchor.cte(name="category_descendants", recursive=True)
@@ -72,13 +69,17 @@ async def get_category_descendants(db: AsyncSession, category_id: UUID) -> List[
     results = await db.execute(statement)
     descendant_ids = results.scalars().all()
 
-    # Converter para lista de UUIDs
-    # descendant_ids already list from .all()
+    if not descendant_ids:
+        logger.warning("Categoria %s não encontrada no banco de dados", category_id)
+        # Retornar lista contendo apenas o ID fornecido para não quebrar a query
+        return [category_id]
 
     logger.info(
-        f"Categoria {category_id} ({category_exists.name}) possui {len(descendant_ids)} ID(s) no resultado (incluindo ela mesma)"
+        "Categoria %s possui %s ID(s) no resultado (incluindo ela mesma)",
+        category_id,
+        len(descendant_ids),
     )
-    logger.debug(f"IDs retornados: {descendant_ids}")
+    logger.debug("IDs retornados: %s", descendant_ids)
 
     # Armazenar no cache
     category_descendants_cache[cache_key] = descendant_ids
@@ -98,15 +99,16 @@ async def create_category(
         # Invalidar cache após criar categoria
         invalidate_category_cache()
 
-        logging.info(
-            f"Nova categoria registrada pelo usuário de ID: {current_user.get_uuid()}"
+        logger.info(
+            "Nova categoria registrada pelo usuário de ID: %s", current_user.get_uuid()
         )
         return new_category
     except IntegrityError as e:
-        logging.error(
-            f"Falha na criação de categoria pelo usuário de ID: {current_user.get_uuid()}"
+        logger.error(
+            "Falha na criação de categoria pelo usuário de ID: %s",
+            current_user.get_uuid(),
         )
-        if isinstance(e.orig, UniqueViolation):
+        if is_unique_violation(e):
             raise CategoryCreationError(
                 f"Já existe uma categoria com o nome {category.name}."
             )
@@ -117,81 +119,75 @@ async def create_category(
 async def get_categories(
     current_user: TokenData, db: AsyncSession, view: str = "user"
 ) -> list[model.CategoryResponse]:
+    user_id = current_user.get_uuid()
+    # A visão global é igual para todos; a do usuário depende das configurações dele
+    cache_key = ("global",) if view == "global" else ("user", user_id)
+    cached = category_list_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     if view == "global":
         # Global view: Raw category data, ignoring user settings
-        query = select(Category).order_by(Category.name)
-        result = await db.execute(query)
-        categories = result.scalars().all()
-
-        return [
-            model.CategoryResponse(
-                id=c.id,
-                name=c.name,
-                alias=None,  # / Global view has no alias
-                slug=c.slug,
-                color_hex=c.color_hex,
-                created_at=c.created_at,
-                updated_at=c.updated_at,
-                is_investment=c.is_investment,
-                ignored=c.ignored,
-            )
-            for c in categories
-        ]
-
-    # User view: Coalesce with user settings
-    query = (
-        select(
+        query = select(
             Category.id,
             Category.name,
-            UserCategorySetting.alias,
+            null().label("alias"),  # / Global view has no alias
             Category.slug,
-            func.coalesce(UserCategorySetting.color_hex, Category.color_hex).label(
-                "color_hex"
-            ),
+            Category.color_hex,
             Category.created_at,
             Category.updated_at,
-            func.coalesce(
-                UserCategorySetting.is_investment, Category.is_investment
-            ).label("is_investment"),
-            func.coalesce(UserCategorySetting.ignored, Category.ignored).label(
-                "ignored"
-            ),
-        )
-        .outerjoin(
-            UserCategorySetting,
-            (UserCategorySetting.category_id == Category.id)
-            & (UserCategorySetting.user_id == current_user.get_uuid()),
+            Category.is_investment,
+            Category.ignored,
+        ).order_by(Category.name)
+    else:
+        # User view: Coalesce with user settings
+        query = (
+            select(
+                Category.id,
+                Category.name,
+                UserCategorySetting.alias,
+                Category.slug,
+                func.coalesce(UserCategorySetting.color_hex, Category.color_hex).label(
+                    "color_hex"
+                ),
+                Category.created_at,
+                Category.updated_at,
+                func.coalesce(
+                    UserCategorySetting.is_investment, Category.is_investment
+                ).label("is_investment"),
+                func.coalesce(UserCategorySetting.ignored, Category.ignored).label(
+                    "ignored"
+                ),
+            )
+            .outerjoin(
+                UserCategorySetting,
+                (UserCategorySetting.category_id == Category.id)
+                & (UserCategorySetting.user_id == user_id),
+            )
+            .order_by(Category.name)
         )
-        .order_by(Category.name)
-    )
 
-    logging.info(
-        f"Recuperado todas as categorias pelo usuário {current_user.get_uuid()} (view={view})"
+    logger.info(
+        "Recuperado todas as categorias pelo usuário %s (view=%s)",
+        user_id,
+        view,
     )
 
     result = await db.execute(query)
-    rows = result.all()
 
-    # Manually map rows to model.CategoryResponse since we are selecting specific fields/expressions
-    return [
-        model.CategoryResponse(
-            id=row.id,
-            name=row.name,
-            alias=row.alias,
-            slug=row.slug,
-            color_hex=row.color_hex,
-            created_at=row.created_at,
-            updated_at=row.updated_at,
-            is_investment=row.is_investment,
-            ignored=row.ignored,
-        )
-        for row in rows
+    # As colunas já vêm com os nomes e tipos do schema: model_construct evita
+    # revalidar cada linha vinda do banco
+    response = [
+        model.CategoryResponse.model_construct(**row) for row in result.mappings()
     ]
+    category_list_cache[cache_key] = response
+    return response
 
 
 async def get_category_by_id(
     current_user: TokenData, db: AsyncSession, category_id: UUID
 ) -> model.CategoryResponse:
+    user_id = current_user.get_uuid()
     query = (
         select(
             Category.id,
@@ -213,35 +209,29 @@ async def get_category_by_id(
         .outerjoin(
             UserCategorySetting,
             (UserCategorySetting.category_id == Category.id)
-            & (UserCategorySetting.user_id == current_user.get_uuid()),
+            & (UserCategorySetting.user_id == user_id),
         )
         .filter(Category.id == category_id)
     )
 
     result = await db.execute(query)
-    category = result.first()
+    category = result.mappings().first()
 
     if not category:
-        logging.warning(
-            f"Categoria de ID {category_id} não encontrada pelo usuário de ID {current_user.get_uuid()}"
+        logger.warning(
+            "Categoria de ID %s não encontrada pelo usuário de ID %s",
+            category_id,
+            user_id,
         )
         raise CategoryNotFoundError(category_id)
 
-    logging.info(
-        f"Categoria de ID {category_id} recuperada pelo usuário de ID {current_user.get_uuid()}"
+    logger.info(
+        "Categoria de ID %s recuperada pelo usuário de ID %s",
+        category_id,
+        user_id,
     )
 
-    return model.CategoryResponse(
-        id=category.id,
-        name=category.name,
-        alias=category.alias,
-        slug=category.slug,
-        color_hex=category.color_hex,
-        created_at=category.created_at,
-        updated_at=category.updated_at,
-        is_investment=category.is_investment,
-        ignored=category.ignored,
-    )
+    return model.CategoryResponse.model_construct(**category)
 
 
 async def update_category(
@@ -250,25 +240,66 @@ async def update_category(
     category_id: UUID,
     category_update: model.CategoryUpdate,
 ) -> model.CategoryResponse:
-    # First get original to verify existence
-    result = await db.execute(select(Category).filter(Category.id == category_id))
-    original_category = result.scalars().first()
-
-    if not original_category:
-        raise CategoryNotFoundError(category_id)
-
+    user_id = current_user.get_uuid()
     category_data = category_update.model_dump(exclude_unset=True)
+    if not category_data:
+        return await get_category_by_id(current_user, db, category_id)
+
+    # Personalização do usuário lida por subqueries escalares no RETURNING: a
+    # resposta sai do próprio UPDATE, sem um SELECT depois
+    def user_setting(column):
+        return (
+            select(column)
+            .where(
+                UserCategorySetting.category_id == category_id,
+                UserCategorySetting.user_id == user_id,
+            )
+            .scalar_subquery()
+        )
 
-    # Use existing object update
-    for key, value in category_data.items():
-        setattr(original_category, key, value)
+    # UPDATE ... RETURNING: verifica a existência no mesmo statement
+    result = await db.execute(
+        update(Category)
+        .where(Category.id == category_id)
+        .values(**category_data)
+        .returning(
+            Category.id,
+            Category.name,
+            user_setting(UserCategorySetting.alias).label("alias"),
+            Category.slug,
+            func.coalesce(
+                user_setting(UserCategorySetting.color_hex), Category.color_hex
+            ).label("color_hex"),
+            Category.created_at,
+            Category.updated_at,
+            func.coalesce(
+                user_setting(UserCategorySetting.is_investment), Category.is_investment
+            ).label("is_investment"),
+            func.coalesce(
+                user_setting(UserCategorySetting.ignored), Category.ignored
+            ).label("ignored"),
+        )
+    )
+    category = result.first()
+    if category is None:
+        raise CategoryNotFoundError(category_id)
 
     await db.commit()
 
     # Invalidar cache após atualizar categoria
     invalidate_category_cache()
 
-    return await get_category_by_id(current_user, db, category_id)
+    return model.CategoryResponse(
+        id=category.id,
+        name=category.name,
+        alias=category.alias,
+        slug=category.slug,
+        color_hex=category.color_hex,
+        created_at=category.created_at,
+        updated_at=category.updated_at,
+        is_investment=category.is_investment,
+        ignored=category.ignored,
+    )
 
 
 async def update_category_settings(
@@ -277,19 +308,26 @@ async def update_category_settings(
     category_id: UUID,
     settings_update: model.CategorySettingsUpdate,
 ) -> model.CategoryResponse:
-    # Verify category exists AND fetch global values to compare
-    result = await db.execute(select(Category).filter(Category.id == category_id))
-    category = result.scalars().first()
-
-    if not category:
-        raise CategoryNotFoundError(category_id)
-
     user_id = current_user.get_uuid()
 
+    # Verify category exists AND fetch global values + user setting in one query
     result = await db.execute(
-        select(UserCategorySetting).filter_by(user_id=user_id, category_id=category_id)
+        select(Category, UserCategorySetting)
+        .outerjoin(
+            UserCategorySetting,
+            (UserCategorySetting.category_id == Category.id)
+            & (UserCategorySetting.user_id == user_id),
+        )
+        .where(Category.id == category_id)
+        # O upsert abaixo não passa pelo ORM: não confiar no identity map
+        .execution_options(populate_existing=True)
     )
-    setting = result.scalars().first()
+    row = result.first()
+
+    if not row:
+        raise CategoryNotFoundError(category_id)
+
+    category, setting = row
 
     # Determine current effective values (to handle partial updates if needed, though usually strict replacement)
     current_alias = setting.alias if setting else None
@@ -362,9 +400,13 @@ async def update_category_settings(
 
     if is_fully_redundant:
         if setting:
-            await db.delete(setting)
-            logging.info(
-                f"Removendo personalização redundante da categoria {category_id} para usuário {user_id}"
+            await db.execute(
+                delete(UserCategorySetting).where(UserCategorySetting.id == setting.id)
+            )
+            logger.info(
+                "Removendo personalização redundante da categoria %s para usuário %s",
+                category_id,
+                user_id,
             )
     else:
         # Prepare values for DB
@@ -377,25 +419,46 @@ async def update_category_settings(
         # "color_hex = Column(String, nullable=False)"
         db_color = new_color  # Always store valid color
 
-        if setting:
-            setting.alias = new_alias
-            setting.color_hex = db_color
-            setting.is_investment = db_invest
-            setting.ignored = db_ignored
-        else:
-            setting = UserCategorySetting(
-                user_id=user_id,
-                category_id=category_id,
-                alias=new_alias,
-                color_hex=db_color,
-                is_investment=db_invest,
-                ignored=db_ignored,
+        # Upsert em um statement: cria ou atualiza a personalização sem
+        # depender do SELECT acima (requisições concorrentes não colidem na
+        # uq_user_category)
+        stmt = insert(UserCategorySetting).values(
+            id=uuid4(),
+            user_id=user_id,
+            category_id=category_id,
+            alias=new_alias,
+            color_hex=db_color,
+            is_investment=db_invest,
+            ignored=db_ignored,
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "category_id"],
+                set_={
+                    "alias": stmt.excluded.alias,
+                    "color_hex": stmt.excluded.color_hex,
+                    "is_investment": stmt.excluded.is_investment,
+                    "ignored": stmt.excluded.ignored,
+                    "updated_at": func.now(),
+                },
             )
-            db.add(setting)
+        )
 
     await db.commit()
+    category_list_cache.pop(("user", user_id), None)
 
-    return await get_category_by_id(current_user, db, category_id)
+    # Os valores efetivos já foram resolvidos acima; sem SELECT para ecoá-los
+    return model.CategoryResponse(
+        id=category.id,
+        name=category.name,
+        alias=new_alias,
+        slug=category.slug,
+        color_hex=new_color,
+        created_at=category.created_at,
+        updated_at=category.updated_at,
+        is_investment=target_invest,
+        ignored=target_ignored,
+    )
 
 
 async def delete_category(
@@ -406,21 +469,22 @@ async def delete_category(
     # but we should probably delete them too or rely on FK constraint.
     # Assuming FK constraint handles it or it's fine.
 
-    # Just check exist + delete
-    result = await db.execute(select(Category).filter(Category.id == category_id))
-    category = result.scalars().first()
-
-    if not category:
+    # DELETE ... RETURNING: verifica a existência no mesmo statement
+    result = await db.execute(
+        delete(Category).where(Category.id == category_id).returning(Category.id)
+    )
+    if result.scalar_one_or_none() is None:
         raise CategoryNotFoundError(category_id)
 
-    await db.delete(category)
     await db.commit()
 
     # Invalidar cache após deletar categoria
     invalidate_category_cache()
 
-    logging.info(
-        f"Categoria de ID {category_id} foi excluído pelo usuário de ID {current_user.get_uuid()}"
+    logger.info(
+        "Categoria de ID %s foi excluído pelo usuário de ID %s",
+        category_id,
+        current_user.get_uuid(),
     )
 
 
@@ -432,6 +496,7 @@ async def search_categories(
     limit: int = 12,
     scope: str = "general",
 ) -> PaginatedResponse[model.CategoryResponse]:
+    user_id = current_user.get_uuid()
     query = select(
         Category.id,
         Category.name,
@@ -449,7 +514,7 @@ async def search_categories(
     ).outerjoin(
         UserCategorySetting,
         (UserCategorySetting.category_id == Category.id)
-        & (UserCategorySetting.user_id == current_user.get_uuid()),
+        & (UserCategorySetting.user_id == user_id),
     )
 
     # Apply scope filters
@@ -477,32 +542,43 @@ async def search_categories(
     # scope == "all" -> no filter
 
     if query_str:
-        search_term = f"%{query_str}%"
+        # Padrão parametrizado e com curingas escapados: atendido pelos índices
+        # trigram de categories.name e user_category_settings.alias
+        search_term = contains_pattern(query_str)
         query = query.filter(
             or_(
-                Category.name.ilike(search_term),
-                UserCategorySetting.alias.ilike(search_term),
+                Category.name.ilike(search_term, escape="\\"),
+                UserCategorySetting.alias.ilike(search_term, escape="\\"),
             )
         )
 
-    # Sort by name
-    query = query.order_by(Category.name)
+    # Sort by name; o id desempata nomes repetidos (o nome não é único) para
+    # que uma categoria não apareça em duas páginas nem suma entre elas
+    query = query.order_by(Category.name, Category.id)
 
     # Pagination logic
-    # Estimate total count
-    # For async pagination, usually we run a separate count query
-    # Clone query for count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
-
     limit = max(1, min(limit, 100))  # Clamp limit
     offset = (page - 1) * limit
 
-    items_query = query.offset(offset).limit(limit)
+    # O total vem junto das linhas via count(*) OVER (), calculado antes do
+    # OFFSET/LIMIT: uma execução só em vez de um SELECT count(*) separado
+    items_query = (
+        query.add_columns(func.count().over().label("total"))
+        .offset(offset)
+        .limit(limit)
+    )
     result = await db.execute(items_query)
     items = result.all()
 
+    if items:
+        total = items[0].total
+    elif page == 1:
+        total = 0
+    else:
+        # Página além da última: sem linhas não há total, então conta à parte
+        count_query = select(func.count()).select_from(query.subquery())
+        total = (await db.execute(count_query)).scalar_one()
+
     # Map to schema
     results = [
         model.CategoryResponse(
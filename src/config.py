@@ -6,6 +6,23 @@ load_dotenv()
 
 class Settings:
     API_BASE_URL: str = os.getenv("API_BASE_URL", "http://localhost:8000")
+    # O schema é gerenciado pelo Alembic; create_all no startup só quando pedido
+    CREATE_ALL_ON_STARTUP: bool = os.getenv("CREATE_ALL_ON_STARTUP") == "1"
+
+    # Pool de conexões do engine assíncrono
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+    # Recicla conexões antes que proxies/firewalls derrubem as ociosas
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # Falha rápido em vez de enfileirar requisições indefinidamente
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Conexões abertas no startup para a primeira leva de requisições não
+    # pagar o handshake (0 desliga)
+    DB_POOL_WARMUP: int = int(os.getenv("DB_POOL_WARMUP", str(DB_POOL_SIZE)))
+    # Prepared statements mantidos por conexão (asyncpg e adapter do SQLAlchemy)
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+    # DATABASE_URL aponta para um PgBouncer em modo transaction pooling
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER") == "1"
 
 
 settings = Settings()
@@ -2,8 +2,15 @@ from typing import Annotated, AsyncGenerator
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy import DDL, event, text
+import asyncio
+import logging
 import os
+from uuid import uuid4
 from dotenv import load_dotenv
+from ..config import settings
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 
@@ -22,7 +29,42 @@ if DATABASE_URL and DATABASE_URL.startswith("postgresql://"):
 """ Or hard code SQLite here """
 # DATABASE_URL = 'sqlite+aiosqlite:///./todosapp.db'
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+if settings.DB_PGBOUNCER:
+    # Em transaction pooling cada transação pode cair numa conexão diferente do
+    # servidor: prepared statements não podem ser reaproveitados nem ter nomes
+    # repetidos, e o PgBouncer recusa server_settings desconhecidos
+    connect_args = {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+else:
+    connect_args = {
+        # Os padrões (100) são pequenos para a variedade de queries dos
+        # serviços; acima disso o LRU volta a preparar statements a cada uso
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "server_settings": {
+            "tcp_keepalives_idle": "60",
+            "tcp_keepalives_interval": "10",
+            "tcp_keepalives_count": "3",
+        },
+    }
+
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    # Descarta conexões mortas (restart do banco, timeout de rede) no checkout
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    # Linhas por INSERT multi-VALUES em execuções executemany; o limite de
+    # parâmetros por statement do driver continua valendo
+    insertmanyvalues_page_size=10000,
+    connect_args=connect_args,
+)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -34,6 +76,33 @@ AsyncSessionLocal = async_sessionmaker(
 
 Base = declarative_base()
 
+# Os índices gin_trgm_ops dependem da extensão pg_trgm (create_all em banco novo)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+async def warm_up_pool(size: int) -> None:
+    """Abre `size` conexões em paralelo e as devolve ao pool já autenticadas."""
+
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    results = await asyncio.gather(
+        *(_ping() for _ in range(size)), return_exceptions=True
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        logger.warning(
+            "Aquecimento do pool: %s de %s conexões falharam: %s",
+            len(failures),
+            size,
+            failures[0],
+        )
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
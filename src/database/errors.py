@@ -0,0 +1,9 @@
+from sqlalchemy.exc import IntegrityError
+
+UNIQUE_VIOLATION_SQLSTATE = "23505"
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    # O driver asyncpg chega aqui embrulhado pelo adaptador do SQLAlchemy,
+    # então a checagem é pelo SQLSTATE e não pela classe da exceção
+    return getattr(error.orig, "sqlstate", None) == UNIQUE_VIOLATION_SQLSTATE
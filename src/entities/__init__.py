@@ -0,0 +1,10 @@
+# Importar este pacote registra todos os models no Base.metadata
+# (usado pelo create_all no main.py e pelo autogenerate do Alembic)
+from .user import User  # noqa: F401
+from .bank import Bank  # noqa: F401
+from .category import Category  # noqa: F401
+from .merchant import Merchant  # noqa: F401
+from .merchant_alias import MerchantAlias  # noqa: F401
+from .transaction import Transaction  # noqa: F401
+from .open_finance_item import OpenFinanceItem  # noqa: F401
+from .open_finance_account import OpenFinanceAccount  # noqa: F401
@@ -8,6 +8,7 @@ from sqlalchemy import (
     text,
     func,
     Boolean,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -46,6 +47,16 @@ class Category(Base):
         server_default=func.now(),
     )
 
+    __table_args__ = (
+        # Busca por trecho do nome (ILIKE '%termo%')
+        Index(
+            "idx_category_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
     def __repr__(self):
         return f"<Category(name='{self.name}', color_hex='{self.color_hex}')>"
 
@@ -83,6 +94,13 @@ class UserCategorySetting(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "category_id", name="uq_user_category"),
+        # Busca por trecho do apelido (ILIKE '%termo%')
+        Index(
+            "idx_user_category_setting_alias_trgm",
+            "alias",
+            postgresql_using="gin",
+            postgresql_ops={"alias": "gin_trgm_ops"},
+        ),
     )
 
     def __repr__(self):
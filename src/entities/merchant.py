@@ -6,6 +6,9 @@ from sqlalchemy import (
     UniqueConstraint,
     text,
     func,
+    DDL,
+    Index,
+    event,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -18,6 +21,20 @@ class Merchant(Base):
     __tablename__ = "merchants"
     __table_args__ = (
         UniqueConstraint("name", "user_id", name="uq_merchant_name_user_id"),
+        # Filtros por usuário (+ alias) resolvidos só pelo índice
+        Index(
+            "ix_merchants_user_alias",
+            "user_id",
+            "merchant_alias_id",
+            postgresql_include=["id"],
+        ),
+        # Busca por substring (ILIKE '%termo%') no nome do merchant
+        Index(
+            "idx_merchant_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
     )
 
     id = Column(
@@ -29,7 +46,10 @@ class Merchant(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False)
     merchant_alias_id = Column(
-        UUID(as_uuid=True), ForeignKey("merchant_aliases.id"), nullable=True
+        UUID(as_uuid=True),
+        ForeignKey("merchant_aliases.id"),
+        nullable=True,
+        index=True,
     )
 
     merchant_alias = relationship("MerchantAlias", back_populates="merchants")
@@ -54,3 +74,63 @@ class Merchant(Base):
 
     def __repr__(self):
         return f"<Merchant(name='{self.name}', alias_id='{self.merchant_alias_id}')>"
+
+
+# Aliases que ficam sem merchants (reatribuição ou exclusão) são removidos
+# pelo banco; espelha a migração 4e6a1c8d2f90 para bancos criados via create_all.
+# Não há limpeza na aplicação: o trigger é o único mecanismo.
+_DELETE_ORPHAN_ALIASES_FUNCTION = DDL("""
+    CREATE OR REPLACE FUNCTION delete_orphan_merchant_aliases()
+    RETURNS trigger AS $$
+    BEGIN
+        DELETE FROM merchant_aliases a
+        WHERE a.id IN (
+            SELECT o.merchant_alias_id FROM old_merchants o
+            WHERE o.merchant_alias_id IS NOT NULL
+        )
+        AND NOT EXISTS (
+            SELECT 1 FROM merchants m WHERE m.merchant_alias_id = a.id
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+
+event.listen(
+    Merchant.__table__,
+    "after_create",
+    _DELETE_ORPHAN_ALIASES_FUNCTION.execute_if(dialect="postgresql"),
+)
+for _event in ("update", "delete"):
+    event.listen(
+        Merchant.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER merchants_cleanup_aliases_on_{_event} "
+            f"AFTER {_event.upper()} ON merchants "
+            "REFERENCING OLD TABLE AS old_merchants "
+            "FOR EACH STATEMENT EXECUTE FUNCTION delete_orphan_merchant_aliases()"
+        ).execute_if(dialect="postgresql"),
+    )
+
+# SQLite (banco dos testes) não tem tabelas de transição: o mesmo invariante
+# vira triggers por linha, para que o schema de teste se comporte como o de produção
+for _event, _when in (
+    ("update", "UPDATE OF merchant_alias_id"),
+    ("delete", "DELETE"),
+):
+    event.listen(
+        Merchant.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER merchants_cleanup_aliases_on_{_event} "
+            f"AFTER {_when} ON merchants "
+            "FOR EACH ROW WHEN OLD.merchant_alias_id IS NOT NULL "
+            "BEGIN "
+            "DELETE FROM merchant_aliases WHERE id = OLD.merchant_alias_id "
+            "AND NOT EXISTS ("
+            "SELECT 1 FROM merchants WHERE merchant_alias_id = OLD.merchant_alias_id"
+            "); "
+            "END"
+        ).execute_if(dialect="sqlite"),
+    )
@@ -7,6 +7,7 @@ from sqlalchemy import (
     func,
     UniqueConstraint,
     Boolean,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -24,6 +25,21 @@ class MerchantAlias(Base):
     __tablename__ = "merchant_aliases"
     __table_args__ = (
         UniqueConstraint("user_id", "pattern", name="uq_merchant_alias_user_pattern"),
+        # Listagens filtram por usuário + escopo e ordenam por pattern
+        Index(
+            "ix_merchant_aliases_user_scope_pattern",
+            "user_id",
+            "is_investment",
+            "ignored",
+            "pattern",
+        ),
+        # Índice trigram: permite que o ILIKE '%q%' da busca use índice no Postgres
+        Index(
+            "idx_merchant_alias_pattern_trgm",
+            "pattern",
+            postgresql_using="gin",
+            postgresql_ops={"pattern": "gin_trgm_ops"},
+        ),
     )
 
     id = Column(
@@ -51,8 +67,11 @@ class MerchantAlias(Base):
         server_default=func.now(),
     )
 
+    # Sem carga implícita: quem precisa dos merchants usa selectinload
+    # explicitamente, e qualquer acesso não carregado falha em vez de gerar
+    # uma consulta extra escondida
     merchants = relationship(
-        "Merchant", back_populates="merchant_alias", lazy="selectin"
+        "Merchant", back_populates="merchant_alias", lazy="raise_on_sql"
     )
 
     @property
@@ -19,4 +19,11 @@ class BankNotFoundError(BankError):
 
 class BankCreationError(BankError):
     def __init__(self, error: str):
-        super().__init__(status_code=500, detail=f"Falha na criação do banco: {error}")
\ No newline at end of file
+        super().__init__(status_code=500, detail=f"Falha na criação do banco: {error}")
+
+
+class BankUpdateError(BankError):
+    def __init__(self, error: str):
+        super().__init__(
+            status_code=400, detail=f"Falha na atualização do banco: {error}"
+        )
@@ -1,15 +1,17 @@
 from datetime import datetime, timezone
-from uuid import uuid4, UUID
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import delete
 from sqlalchemy.exc import IntegrityError
-from psycopg2.errors import UniqueViolation
+from ..database.errors import is_unique_violation
 from . import model
 from src.aliases import model as alias_model
 from ..auth.model import TokenData
 from ..entities.merchant import Merchant
 from ..entities.merchant_alias import MerchantAlias
+from ..utils.ids import uuid7
+from ..utils.search import contains_pattern
 from ..exceptions.merchants import (
     MerchantCreationError,
     MerchantNotFoundError,
@@ -40,7 +42,7 @@ async def create_merchant(
                 new_merchant.merchant_alias_id = existing_alias.id
             else:
                 # Create a new alias with the same name
-                new_alias_id = uuid4()
+                new_alias_id = uuid7()
                 new_alias = MerchantAlias(
                     id=new_alias_id,
                     pattern=new_merchant.name,
@@ -66,7 +68,7 @@ async def create_merchant(
         logging.error(
             f"Falha na criação de merchant: {merchant.name} pelo usuário {current_user.get_uuid()}"
         )
-        if isinstance(e.orig, UniqueViolation):
+        if is_unique_violation(e):
             raise MerchantCreationError(
                 f"Já existe um merchant com o nome {merchant.name}."
             )
@@ -92,7 +94,8 @@ async def search_merchants(
     result = await db.execute(
         select(Merchant)
         .filter(Merchant.user_id == current_user.get_uuid())
-        .filter(Merchant.name.ilike(f"%{query}%"))
+        .filter(Merchant.name.ilike(contains_pattern(query), escape="\\"))
+        .order_by(Merchant.name)
         .limit(limit)
     )
     merchants = result.scalars().all()
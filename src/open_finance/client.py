@@ -1,5 +1,6 @@
 import os
 import uuid
+from threading import Lock
 import pluggy_sdk
 from datetime import datetime
 from typing import Optional, List, Dict, Any
@@ -17,22 +18,32 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Um arquivo por conta: get_transactions roda em paralelo para várias contas
+DUMP_PATH = "pluggy_transactions_dump_{account_id}.json"
+
 
 class PluggyClient:
     def __init__(self):
         self.client_id = os.getenv("PLUGGY_CLIENT_ID")
         self.client_secret = os.getenv("PLUGGY_CLIENT_SECRET")
         self.base_url = os.getenv("PLUGGY_BASE_URL", "https://api.pluggy.ai")
+        # Debug: grava as transações recebidas em disco (desligado por padrão)
+        self.dump_transactions = os.getenv("PLUGGY_DUMP_TRANSACTIONS") == "1"
 
         self.configuration = pluggy_sdk.Configuration(host=self.base_url)
         self.api_client = pluggy_sdk.ApiClient(self.configuration)
         self._api_key: Optional[str] = None
+        # get_transactions roda em várias threads do executor: só uma autentica
+        self._auth_lock = Lock()
 
     def _get_api_client(self):
         """Returns the authenticated api client, performing auth if needed."""
         # Simply check if the key is set. In production, check expiry.
         if not self.configuration.api_key.get("default"):
-            self._authenticate()
+            with self._auth_lock:
+                # Outra thread pode ter autenticado enquanto esperávamos o lock
+                if not self.configuration.api_key.get("default"):
+                    self._authenticate()
         return self.api_client
 
     def _authenticate(self):
@@ -108,10 +119,25 @@ class PluggyClient:
         import json
 
         data = json.loads(resp.data.decode("utf-8"))
-        # Dump to file for inspection
-        with open("pluggy_transactions_dump.json", "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        return data.get("results", [])
+        results = data.get("results", [])
+        if self.dump_transactions:
+            self._dump_transactions(results, DUMP_PATH.format(account_id=account_id))
+        return results
+
+    def _dump_transactions(self, transactions: List[Dict[str, Any]], path: str) -> None:
+        """
+        Dumps transactions for inspection, one object at a time, instead of
+        building a single indented JSON document in memory.
+        """
+        import json
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("[")
+            for index, tx in enumerate(transactions):
+                if index:
+                    f.write(",\n")
+                f.write(json.dumps(tx, ensure_ascii=False, default=str))
+            f.write("]\n")
 
     def get_categories(self) -> List[Dict[str, Any]]:
         """Fetches all available categories from Pluggy."""
@@ -127,8 +153,11 @@ class PluggyClient:
         data = json.loads(resp.data.decode("utf-8"))
         return data.get("results", [])
 
-    def get_connectors(self) -> List[Dict[str, Any]]:
-        """Fetches all available connectors (banks/institutions) from Pluggy."""
+    def get_connectors(self, product: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fetches all available connectors (banks/institutions) from Pluggy.
+        :param product: Optional product filter (e.g., 'TRANSACTIONS').
+        """
         client = self._get_api_client()
         # Connectors are usually under /connectors. SDK usually has ConnectorApi.
         from pluggy_sdk.api import connector_api
@@ -139,7 +168,11 @@ class PluggyClient:
         import json
 
         data = json.loads(resp.data.decode("utf-8"))
-        return data.get("results", [])
+        results = data.get("results", [])
+        if product:
+            # A API não filtra por produto; descarta o resto antes de devolver
+            results = [c for c in results if product in (c.get("products") or ())]
+        return results
 
 
 client = PluggyClient()
@@ -165,5 +165,6 @@ async def sync_data(db: DbSession):
     """
     Triggers synchronization of system data with Pluggy (Categories, Banks/Connectors).
     """
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, lambda: service.sync_data(db))
+    # sync_data is async (AsyncSession): await it on the loop instead of
+    # handing the coroutine to a thread executor
+    return await service.sync_data(db)
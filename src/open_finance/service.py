@@ -37,6 +37,9 @@ from src.entities.merchant_alias import MerchantAlias
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of simultaneous Pluggy requests when syncing an Item
+PLUGGY_FETCH_CONCURRENCY = 8
+
 
 async def sync_accounts(item_id: uuid.UUID, pluggy_item_id: str, db: AsyncSession):
     """
@@ -356,17 +359,20 @@ async def _sync_transactions_for_single_account(
     db: AsyncSession,
     category_map: Dict[str, Any],
     fallback_category: Any,
+    transactions: Optional[List[Dict[str, Any]]] = None,
 ):
     """
     Helper function to sync transactions for a single account.
+    If `transactions` is not given, they are fetched from Pluggy here.
     """
-    logger.info(f"Buscando transações para a conta {account.name} ({account.id})")
+    if transactions is None:
+        logger.info(f"Buscando transações para a conta {account.name} ({account.id})")
 
-    # Fetch from Pluggy (Blocking I/O - run in executor)
-    loop = asyncio.get_running_loop()
-    transactions = await loop.run_in_executor(
-        None, lambda: client.get_transactions(account.pluggy_account_id)
-    )
+        # Fetch from Pluggy (Blocking I/O - run in executor)
+        loop = asyncio.get_running_loop()
+        transactions = await loop.run_in_executor(
+            None, lambda: client.get_transactions(account.pluggy_account_id)
+        )
 
     for tx in transactions:
         # --- 1. Category Mapping ---
@@ -523,6 +529,28 @@ async def _sync_transactions_for_single_account(
     logger.info(f"Sincronização concluída para conta {account.name}")
 
 
+async def _fetch_transactions_for_accounts(
+    accounts: List[OpenFinanceAccount],
+) -> List[List[Dict[str, Any]]]:
+    """
+    Fetches transactions for several accounts from Pluggy concurrently
+    (bounded by PLUGGY_FETCH_CONCURRENCY), preserving the accounts order.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(PLUGGY_FETCH_CONCURRENCY)
+
+    async def fetch(account: OpenFinanceAccount) -> List[Dict[str, Any]]:
+        async with semaphore:
+            logger.info(
+                f"Buscando transações para a conta {account.name} ({account.id})"
+            )
+            return await loop.run_in_executor(
+                None, client.get_transactions, account.pluggy_account_id
+            )
+
+    return await asyncio.gather(*(fetch(account) for account in accounts))
+
+
 async def sync_transactions_for_item(
     item_id: uuid.UUID, user_id: uuid.UUID, db: AsyncSession
 ):
@@ -555,7 +583,11 @@ async def sync_transactions_for_item(
         if not fallback_category and all_categories:
             fallback_category = all_categories[0]
 
-        for account in accounts:
+        # Network fetches run concurrently; DB writes stay sequential since
+        # the session cannot be shared between concurrent tasks.
+        accounts_transactions = await _fetch_transactions_for_accounts(accounts)
+
+        for account, transactions in zip(accounts, accounts_transactions):
             await _sync_transactions_for_single_account(
                 account,
                 user_id,
@@ -564,6 +596,7 @@ async def sync_transactions_for_item(
                 db,
                 category_map,
                 fallback_category,
+                transactions,
             )
 
         item.status = ItemStatus.UPDATED
@@ -0,0 +1,29 @@
+from functools import lru_cache
+from typing import Annotated
+from pydantic import AfterValidator, StringConstraints, WithJsonSchema
+from pydantic.networks import validate_email
+
+
+@lru_cache(maxsize=4096)
+def _validate_email(value: str) -> str:
+    # Mesma validação/normalização do EmailStr do Pydantic (email-validator),
+    # mas memorizada: o mesmo email volta em toda resposta de /me e /users/me.
+    # Emails inválidos levantam erro e não entram no cache.
+    _, email = validate_email(value)
+    return email
+
+
+EmailStr = Annotated[
+    str,
+    AfterValidator(_validate_email),
+    WithJsonSchema({"type": "string", "format": "email"}),
+]
+
+
+# Cor no formato #RRGGBB (bancos e categorias): um único tipo compartilhado.
+# O pydantic-core checa o tamanho antes do regex (ambos em Rust), então
+# entradas com tamanho errado são rejeitadas sem passar pelo regex
+HexColor = Annotated[
+    str,
+    StringConstraints(min_length=7, max_length=7, pattern=r"^#[0-9A-Fa-f]{6}$"),
+]
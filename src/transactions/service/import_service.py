@@ -106,11 +106,16 @@ async def _execute_bulk_insert(
     db: AsyncSession, transactions_dicts: List[TransactionDict]
 ) -> List[Transaction]:
     try:
-        stmt = insert(Transaction).values(transactions_dicts)
+        # Parâmetros passados à parte (executemany): o SQLAlchemy dobra as
+        # linhas em INSERTs multi-VALUES paginados ("insertmanyvalues"),
+        # respeitando o limite de parâmetros por statement do asyncpg.
+        # Sem sort_by_parameter_order: com ON CONFLICT e sem sentinel ele
+        # força um INSERT por linha, e ninguém depende da ordem do RETURNING
+        stmt = insert(Transaction)
         stmt = stmt.on_conflict_do_nothing(index_elements=["id"])
         stmt = stmt.returning(Transaction)
 
-        result = await db.scalars(stmt)
+        result = await db.scalars(stmt, transactions_dicts)
         created_transactions = result.all()
         await db.commit()
 
@@ -205,31 +210,41 @@ async def _fetch_existing_transactions(
     return result.scalars().all()
 
 
-async def _resolve_transaction_category(
+async def _load_merchant_categories(
     db: AsyncSession,
     user_id: UUID,
-    transaction: model.TransactionImportResponse,
-) -> model.CategoryResponse | None:
+    titles: set[str],
+) -> dict[str, Category | None]:
+    """
+    Busca de uma vez os merchants do usuário cujo nome bate com algum título
+    importado, junto da categoria de cada um (``None`` se não tiver).
+    """
+    if not titles:
+        return {}
+
     stmt = (
-        select(Merchant, Category)
+        select(Merchant.name, Category)
         .outerjoin(Category, Merchant.category_id == Category.id)
-        .filter(Merchant.name == transaction.title)
+        .filter(Merchant.name.in_(titles))
         .filter(Merchant.user_id == user_id)
     )
     result = await db.execute(stmt)
-    match = result.first()
+    return {name: category for name, category in result.all()}
 
-    if match:
-        merchant, category = match
-        suggested_category = merchant.category if merchant.category else None
 
-        if suggested_category:
-            from src.categories.model import CategorySimpleResponse as CategorySchema
+def _resolve_transaction_category(
+    merchant_categories: dict[str, Category | None],
+    transaction: model.TransactionImportResponse,
+) -> model.CategoryResponse | None:
+    if transaction.title not in merchant_categories:
+        transaction.has_merchant = False
+        return None
 
-            return CategorySchema.model_validate(suggested_category)
+    suggested_category = merchant_categories[transaction.title]
+    if suggested_category:
+        from src.categories.model import CategorySimpleResponse as CategorySchema
 
-    if not match:
-        transaction.has_merchant = False
+        return CategorySchema.model_validate(suggested_category)
 
     return None
 
@@ -287,12 +302,16 @@ async def import_transactions_from_csv(
         existing_signatures = {(p.date, p.amount, p.title) for p in existing_txs}
         existing_ids = {p.id for p in existing_txs}
 
+        # Uma única consulta para todos os títulos, em vez de uma por linha
+        merchant_categories = await _load_merchant_categories(
+            db, current_user.get_uuid(), {t.title for t in transactions}
+        )
+
         enriched_transactions = []
         for transaction in transactions:
-            category_response = await _resolve_transaction_category(
-                db, current_user.get_uuid(), transaction
+            transaction.category = _resolve_transaction_category(
+                merchant_categories, transaction
             )
-            transaction.category = category_response
             transaction.already_exists = _is_duplicate_transaction(
                 transaction, import_type, existing_ids, existing_signatures
             )
@@ -319,10 +338,12 @@ async def update_transactions_category_bulk(
     user_id: UUID,
     merchant_ids: List[UUID],
     category_id: UUID | None,
+    commit: bool = True,
 ) -> int:
     """
     Atualiza em massa a categoria de todas as transações vinculadas aos merchants fornecidos.
     Executa um único comando UPDATE no banco de dados para alta performance.
+    Com ``commit=False`` o UPDATE fica na transação do chamador.
     """
     if not merchant_ids:
         return 0
@@ -336,7 +357,8 @@ async def update_transactions_category_bulk(
 
     result = await db.execute(stmt)
     updated_count = result.rowcount
-    await db.commit()
+    if commit:
+        await db.commit()
 
     logger.info(
         f"Bulk update: {updated_count} transações atualizadas para categoria {category_id} (Merchants: {len(merchant_ids)})"
@@ -1,8 +1,13 @@
-from pydantic import EmailStr, field_validator
+from pydantic import field_validator
 from uuid import UUID
 from datetime import datetime
 from src.schemas.base import CamelModel
+from src.schemas.types import EmailStr
 from typing import Optional
+from src.config import settings
+
+# Lido uma vez no import em vez de a cada validação de usuário
+_API_BASE_URL = settings.API_BASE_URL
 
 
 class UserResponse(CamelModel):
@@ -17,9 +22,7 @@ class UserResponse(CamelModel):
     @classmethod
     def add_base_url(cls, v: str | None) -> str | None:
         if v and v.startswith("/"):
-            from src.config import settings
-
-            return f"{settings.API_BASE_URL}{v}"
+            return f"{_API_BASE_URL}{v}"
         return v
 
 
@@ -10,7 +10,7 @@ from src.exceptions.users import (
     UserUploadError,
 )
 from src.exceptions.auth import InvalidPasswordError, PasswordMismatchError
-from src.auth.service import verify_password, get_password_hash
+from src.auth.service import verify_password_async, get_password_hash_async
 import logging
 import os
 import shutil
@@ -33,7 +33,9 @@ async def change_password(
         user = await get_user_by_id(db, user_id)
 
         # Verifica a senha do usuário atual
-        if not verify_password(password_change.current_password, user.password_hash):
+        if not await verify_password_async(
+            password_change.current_password, user.password_hash
+        ):
             logging.warning(f"Senha atual inválida para o usuário de ID: {user_id}")
             raise InvalidPasswordError()
 
@@ -43,7 +45,7 @@ async def change_password(
             raise PasswordMismatchError()
 
         # Atualiza a senha
-        user.password_hash = get_password_hash(password_change.new_password)
+        user.password_hash = await get_password_hash_async(password_change.new_password)
         db.add(user)
         await db.commit()
         logging.info(f"Troca de senha bem sucedida para o usuario de ID: {user_id}")
@@ -1,8 +1,10 @@
 """
 Módulo centralizado para gerenciamento de cache da aplicação.
 """
-from cachetools import TTLCache
+from cachetools import TTLCache, TLRUCache
+from threading import Lock
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +13,33 @@ logger = logging.getLogger(__name__)
 # ttl=3600: cada entrada expira após 1 hora (3600 segundos)
 category_descendants_cache: TTLCache = TTLCache(maxsize=1000, ttl=3600)
 
+# Cache de tokens de acesso já verificados: token -> (TokenData, exp do JWT)
+# Evita refazer a verificação HMAC do JWT a cada request autenticada.
+# Cada entrada vive no máximo TOKEN_CACHE_TTL segundos e nunca além do "exp".
+TOKEN_CACHE_TTL = 30
+
+
+def _token_expiration(_token: str, value: tuple, now: float) -> float:
+    return min(now + TOKEN_CACHE_TTL, value[1])
+
+
+token_data_cache: TLRUCache = TLRUCache(
+    maxsize=1024, ttu=_token_expiration, timer=time.time
+)
+# Dependências síncronas rodam no threadpool do FastAPI; o cachetools não é thread-safe
+token_data_cache_lock = Lock()
+
+# Listas de dados de referência já convertidas para o schema de resposta.
+# Bancos só mudam por escrita de admin ou pelo sync com a Pluggy; categorias
+# por escrita de admin ou pelas configurações do próprio usuário. Toda escrita
+# invalida, e o TTL cobre alterações feitas por outros workers.
+REFERENCE_DATA_CACHE_TTL = 60
+
+# Chave: () -> list[BankResponse]
+bank_list_cache: TTLCache = TTLCache(maxsize=1, ttl=REFERENCE_DATA_CACHE_TTL)
+# Chave: ("global",) ou ("user", user_id) -> list[CategoryResponse]
+category_list_cache: TTLCache = TTLCache(maxsize=1024, ttl=REFERENCE_DATA_CACHE_TTL)
+
 
 def invalidate_category_cache() -> None:
     """
@@ -18,9 +47,19 @@ def invalidate_category_cache() -> None:
     Deve ser chamado quando categorias são criadas, modificadas ou deletadas.
     """
     category_descendants_cache.clear()
+    category_list_cache.clear()
     logger.info("Cache de hierarquia de categorias invalidado")
 
 
+def invalidate_bank_cache() -> None:
+    """
+    Invalida a lista de bancos cacheada.
+    Deve ser chamado quando bancos são criados, modificados, deletados ou sincronizados.
+    """
+    bank_list_cache.clear()
+    logger.info("Cache de bancos invalidado")
+
+
 def get_cache_stats() -> dict:
     """
     Retorna estatísticas sobre o cache de categorias.
@@ -32,5 +71,20 @@ def get_cache_stats() -> dict:
             "max_size": category_descendants_cache.maxsize,
             "ttl_seconds": category_descendants_cache.ttl,
             "items": list(category_descendants_cache.keys())[:10]  # Primeiros 10 para preview
-        }
+        },
+        "bank_list_cache": {
+            "current_size": len(bank_list_cache),
+            "max_size": bank_list_cache.maxsize,
+            "ttl_seconds": bank_list_cache.ttl,
+        },
+        "category_list_cache": {
+            "current_size": len(category_list_cache),
+            "max_size": category_list_cache.maxsize,
+            "ttl_seconds": category_list_cache.ttl,
+        },
+        "token_data_cache": {
+            "current_size": len(token_data_cache),
+            "max_size": token_data_cache.maxsize,
+            "ttl_seconds": TOKEN_CACHE_TTL,
+        },
     }
@@ -0,0 +1,20 @@
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    UUID versão 7 (RFC 9562): 48 bits de timestamp em ms seguidos de bits
+    aleatórios. IDs gerados em sequência ficam ordenados, então inserts caem
+    no fim do índice da PK em vez de em páginas aleatórias da B-tree.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= int.from_bytes(os.urandom(10)) & ((1 << 80) - 1)
+    # Versão (7) e variante (RFC 4122/9562)
+    value &= ~(0xF << 76)
+    value |= 0x7 << 76
+    value &= ~(0x3 << 62)
+    value |= 0x2 << 62
+    return uuid.UUID(int=value)
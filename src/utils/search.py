@@ -0,0 +1,9 @@
+def contains_pattern(query: str) -> str:
+    """
+    Monta o padrão do ILIKE para "contém ``query``". Curingas digitados pelo
+    usuário (``%``, ``_``) são escapados e casam literalmente; use com
+    ``escape="\\\\"``. O valor vai como parâmetro, então o texto SQL não muda
+    entre buscas e o índice trigram (gin_trgm_ops) continua utilizável.
+    """
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
@@ -0,0 +1,18 @@
+import re
+import unicodedata
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+# Letras que não se decompõem em NFKD (base + acento) e sumiriam no ASCII
+_EXTRA_LETTERS = str.maketrans(
+    {"ß": "ss", "æ": "ae", "œ": "oe", "ø": "o", "đ": "d", "ł": "l"}
+)
+
+
+def slugify(value: str) -> str:
+    """
+    Slug em minúsculas e ASCII: acentos removidos via NFKD e qualquer sequência
+    de caracteres não alfanuméricos vira um único hífen ("Itaú S.A." -> "itau-s-a").
+    """
+    normalized = unicodedata.normalize("NFKD", value.lower().translate(_EXTRA_LETTERS))
+    ascii_value = normalized.encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM_RE.sub("-", ascii_value).strip("-")
@@ -15,6 +15,7 @@ from main import app
 from src.database.core import get_db, Base
 from src.auth.service import create_access_token, get_password_hash
 from src.auth.model import TokenData
+from src.utils.cache import invalidate_bank_cache, invalidate_category_cache
 from src.entities.user import User
 from src.entities.bank import Bank
 from datetime import timedelta, date
@@ -40,6 +41,10 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Creates a fresh database session for a test.
     """
+    # Cached reference lists belong to the previous test's database
+    invalidate_bank_cache()
+    invalidate_category_cache()
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
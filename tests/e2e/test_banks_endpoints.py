@@ -53,6 +53,36 @@ async def test_update_bank_admin_success(
     assert data["name"] == "Updated Bank"
 
 
+@pytest.mark.asyncio
+async def test_update_bank_without_name_keeps_slug(
+    client: AsyncClient, admin_auth_headers, sample_bank
+):
+    payload = {"color_hex": "#654321"}
+    response = await client.put(
+        f"/banks/{sample_bank.id}", json=payload, headers=admin_auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["name"] == sample_bank.name
+    assert data["slug"] == sample_bank.slug
+    assert data["colorHex"] == "#654321"
+
+
+@pytest.mark.asyncio
+async def test_update_bank_null_name_rejected(
+    client: AsyncClient, admin_auth_headers, sample_bank
+):
+    payload = {"name": None}
+    response = await client.put(
+        f"/banks/{sample_bank.id}", json=payload, headers=admin_auth_headers
+    )
+    assert response.status_code == 400
+
+    response = await client.get(f"/banks/{sample_bank.id}", headers=admin_auth_headers)
+    assert response.status_code == 200
+    assert response.json()["name"] == sample_bank.name
+
+
 @pytest.mark.asyncio
 async def test_delete_bank_admin_success(
     client: AsyncClient, admin_auth_headers, sample_bank
@@ -25,6 +25,27 @@ async def test_get_categories_success(client: AsyncClient, auth_headers):
     assert isinstance(data, list)
 
 
+@pytest.mark.asyncio
+async def test_get_categories_serializes_camel_case(
+    client: AsyncClient, auth_headers, admin_auth_headers
+):
+    await client.post(
+        "/categories/",
+        json={"name": "Listed", "color_hex": "#00FF00"},
+        headers=admin_auth_headers,
+    )
+
+    response = await client.get("/categories/", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    [item] = [c for c in response.json() if c["name"] == "Listed"]
+    assert item["colorHex"] == "#00FF00"
+    assert item["alias"] is None
+    assert {"id", "slug", "isInvestment", "ignored", "createdAt", "updatedAt"} <= (
+        item.keys()
+    )
+
+
 @pytest.mark.asyncio
 async def test_update_category_settings_success(
     client: AsyncClient, auth_headers, admin_auth_headers
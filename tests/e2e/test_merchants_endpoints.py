@@ -64,3 +64,17 @@ async def test_delete_merchant_success(client: AsyncClient, auth_headers):
     # Verify gone
     get_res = await client.get(f"/merchants/{m_id}", headers=auth_headers)
     assert get_res.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_search_merchants_treats_wildcards_literally(
+    client: AsyncClient, auth_headers
+):
+    await client.post("/merchants/", json={"name": "Loja 100%"}, headers=auth_headers)
+    await client.post("/merchants/", json={"name": "Loja 1000"}, headers=auth_headers)
+
+    response = await client.get(
+        "/merchants/search", params={"query": "100%"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert [m["name"] for m in response.json()] == ["Loja 100%"]
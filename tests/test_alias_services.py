@@ -3,7 +3,6 @@ from uuid import uuid4
 from sqlalchemy import select
 from datetime import date
 from decimal import Decimal
-from psycopg2.errors import UniqueViolation
 from sqlalchemy.exc import IntegrityError
 from unittest.mock import patch, AsyncMock
 
@@ -23,6 +22,12 @@ from src.exceptions.aliases import (
 from src.exceptions.merchants import MerchantNotFoundError
 
 
+class FakeUniqueViolation(Exception):
+    """Imita o erro do driver asyncpg (adaptado pelo SQLAlchemy)."""
+
+    sqlstate = "23505"
+
+
 @pytest.fixture
 async def sample_matching_data(db_session, test_user, token_data):
     # Create Merchants
@@ -124,6 +129,25 @@ async def test_create_merchant_alias_group(
     assert m2.merchant_alias_id == alias.id
 
 
+@pytest.mark.asyncio
+async def test_create_merchant_alias_group_many_merchant_ids(
+    db_session, test_user, token_data, sample_merchants
+):
+    m1, m2, _ = sample_merchants
+    merchant_ids = [m1.id, m2.id] + [
+        uuid4() for _ in range(service.MERCHANT_IDS_ARRAY_THRESHOLD)
+    ]
+
+    alias = await service.create_merchant_alias_group(
+        token_data,
+        db_session,
+        model.MerchantAliasCreate(pattern="Uber", merchant_ids=merchant_ids),
+    )
+
+    # Unknown IDs are simply ignored: only the user's merchants are grouped
+    assert set(alias.merchant_ids) == {m1.id, m2.id}
+
+
 @pytest.mark.asyncio
 async def test_create_duplicate_alias_error(
     db_session, test_user, token_data, sample_merchants
@@ -136,8 +160,9 @@ async def test_create_duplicate_alias_error(
 
     await service.create_merchant_alias_group(token_data, db_session, alias_create)
 
-    with pytest.raises(MerchantAliasCreationError):
+    with pytest.raises(MerchantAliasCreationError) as exc_info:
         await service.create_merchant_alias_group(token_data, db_session, alias_create)
+    assert "Já existe um alias com o padrão Uber" in str(exc_info.value)
 
 
 @pytest.mark.asyncio
@@ -161,6 +186,7 @@ async def test_append_merchant_to_alias(
 
     await db_session.refresh(m2)
     assert m2.merchant_alias_id == alias.id
+    assert set(updated_alias.merchant_ids) == {m1.id, m2.id}
 
 
 @pytest.mark.asyncio
@@ -198,6 +224,30 @@ async def test_remove_merchant_from_alias(
     assert new_alias.pattern == m2.name
 
 
+@pytest.mark.asyncio
+async def test_remove_merchant_from_alias_reuses_existing_alias(
+    db_session, test_user, token_data, sample_merchants
+):
+    m1, m2, _ = sample_merchants
+
+    alias_create = model.MerchantAliasCreate(
+        pattern="Uber", merchant_ids=[m1.id, m2.id], category_id=None
+    )
+    alias = await service.create_merchant_alias_group(
+        token_data, db_session, alias_create
+    )
+
+    # An alias already named after m2 exists: it must be reused, not duplicated
+    existing_alias = MerchantAlias(id=uuid4(), pattern=m2.name, user_id=test_user.id)
+    db_session.add(existing_alias)
+    await db_session.commit()
+
+    await service.remove_merchant_from_alias(token_data, db_session, alias.id, m2.id)
+
+    await db_session.refresh(m2)
+    assert m2.merchant_alias_id == existing_alias.id
+
+
 @pytest.mark.asyncio
 async def test_update_merchant_alias_pattern(
     db_session, test_user, token_data, sample_merchants
@@ -244,16 +294,76 @@ async def test_update_merchant_alias_category(
 
 
 @pytest.mark.asyncio
-async def test_cleanup_empty_aliases(db_session, test_user, token_data):
-    # Manually create an empty alias
-    empty_alias = MerchantAlias(id=uuid4(), pattern="Empty", user_id=test_user.id)
-    db_session.add(empty_alias)
+async def test_update_merchant_alias_category_updates_transactions(
+    db_session, test_user, token_data, sample_merchants, sample_category, sample_bank
+):
+    m1, _, _ = sample_merchants
+
+    alias_create = model.MerchantAliasCreate(
+        pattern="Uber", merchant_ids=[m1.id], category_id=None
+    )
+    alias = await service.create_merchant_alias_group(
+        token_data, db_session, alias_create
+    )
+
+    old_category = Category(
+        id=uuid4(), name="Old Category", slug="old-category", color_hex="#000000"
+    )
+    db_session.add(old_category)
+    await db_session.flush()
+
+    tx = Transaction(
+        id=uuid4(),
+        user_id=test_user.id,
+        merchant_id=m1.id,
+        amount=Decimal("-50.00"),
+        date=date.today(),
+        title="Uber Trip",
+        bank_id=sample_bank.id,
+        category_id=old_category.id,
+        type="expense",
+    )
+    db_session.add(tx)
     await db_session.commit()
 
-    await service._cleanup_empty_aliases(db_session, test_user.id)
+    update_data = model.MerchantAliasUpdate(category_id=sample_category.id)
+    await service.update_merchant_alias(token_data, db_session, alias.id, update_data)
+
+    await db_session.refresh(tx)
+    assert tx.category_id == sample_category.id
+
+
+@pytest.mark.asyncio
+async def test_append_merchant_removes_emptied_alias(
+    db_session, test_user, token_data, sample_merchants
+):
+    m1, m2, _ = sample_merchants
+    old_alias_id = m2.merchant_alias_id
+
+    # m2 era o único merchant do seu alias: o trigger remove o alias vazio
+    await service.append_merchant_to_alias(
+        token_data, db_session, m1.merchant_alias_id, m2.id
+    )
 
     with pytest.raises(MerchantAliasNotFoundError):
-        await service.get_alias_by_id(token_data, db_session, empty_alias.id)
+        await service.get_alias_by_id(token_data, db_session, old_alias_id)
+
+
+@pytest.mark.asyncio
+async def test_create_merchant_alias_group_without_merchants_error(
+    db_session, test_user, token_data
+):
+    alias_create = model.MerchantAliasCreate(
+        pattern="Vazio", merchant_ids=[uuid4()], category_id=None
+    )
+
+    with pytest.raises(MerchantAliasCreationError):
+        await service.create_merchant_alias_group(token_data, db_session, alias_create)
+
+    result = await db_session.execute(
+        select(MerchantAlias).where(MerchantAlias.pattern == "Vazio")
+    )
+    assert result.scalars().first() is None
 
 
 @pytest.mark.asyncio
@@ -389,6 +499,13 @@ async def test_get_merchant_aliases_pagination(db_session, test_user, token_data
     page_2_ids = [item.id for item in response_page_2.items]
     assert set(page_1_ids).isdisjoint(set(page_2_ids))
 
+    # Page past the end still reports the real total
+    response_past_end = await service.get_merchant_aliases(
+        token_data, db_session, page=100, size=2
+    )
+    assert response_past_end.items == []
+    assert response_past_end.total == response.total
+
 
 @pytest.mark.asyncio
 async def test_search_aliases_filter(db_session, test_user):
@@ -485,9 +602,9 @@ async def test_create_merchant_alias_group_unique_violation(
 
     with patch.object(
         db_session,
-        "flush",
+        "execute",
         new_callable=AsyncMock,
-        side_effect=IntegrityError("fake", "fake", UniqueViolation()),
+        side_effect=IntegrityError("fake", "fake", FakeUniqueViolation()),
     ):
         with pytest.raises(MerchantAliasCreationError) as exc_info:
             await service.create_merchant_alias_group(
@@ -569,3 +686,16 @@ async def test_search_aliases_filter_unknown_scope(db_session, test_user):
         test_user, db_session, scope="unknown", size=100
     )
     assert res is not None
+
+
+@pytest.mark.asyncio
+async def test_search_aliases_treats_wildcards_literally(db_session, test_user):
+    for pattern in ("100% Natural", "Padaria"):
+        db_session.add(MerchantAlias(id=uuid4(), user_id=test_user.id, pattern=pattern))
+    await db_session.commit()
+
+    res = await service.search_merchants_by_alias(test_user, db_session, query="%")
+    assert [alias.pattern for alias in res.items] == ["100% Natural"]
+
+    res = await service.search_merchants_by_alias(test_user, db_session, query="_")
+    assert res.items == []
@@ -13,14 +13,18 @@ from src.auth.service import (
     get_password_hash,
     get_current_user,
     get_current_user_from_db,
+    get_current_user_with_item_ids,
     get_current_admin,
     login_for_access_token,
     refresh_access_token,
     register_user,
     ALGORITHM,
     SECRET_KEY,
+    _DUMMY_PASSWORD_HASH,
 )
 from src.entities.user import User
+from src.entities.open_finance_item import OpenFinanceItem
+from src.utils.cache import token_data_cache, _token_expiration, TOKEN_CACHE_TTL
 from src.auth.model import TokenData, RegisterUserRequest, Token
 from src.exceptions.auth import AuthenticationError
 from fastapi import HTTPException
@@ -46,6 +50,8 @@ def test_token_data_get_uuid():
     user_id = uuid4()
     td = TokenData(user_id=str(user_id))
     assert td.get_uuid() == user_id
+    # Parsed once and reused on later calls
+    assert td.get_uuid() is td.get_uuid()
 
 
 def test_token_data_get_uuid_none():
@@ -127,6 +133,33 @@ def test_verify_token_tampered():
     assert exc_info.value.detail == "Token inválido"
 
 
+def test_verify_token_uses_cache():
+    token = create_access_token(email="test@test.com", user_id=uuid4())
+    first = verify_token(token)
+
+    with patch("src.auth.service.jwt.decode") as mock_decode:
+        second = verify_token(token)
+
+    mock_decode.assert_not_called()
+    assert second.user_id == first.user_id
+
+
+def test_verify_token_cache_never_outlives_exp():
+    token = create_access_token(
+        email="test@test.com", user_id=uuid4(), expires_delta=timedelta(seconds=5)
+    )
+    verify_token(token)
+
+    cached_value = token_data_cache[(token,)]
+    exp = cached_value[1]
+    # Token expires before the cache TTL would: the entry must expire with it
+    assert _token_expiration(token, cached_value, exp - 5) == exp
+    # Long-lived token: the entry lasts at most TOKEN_CACHE_TTL
+    assert _token_expiration(token, cached_value, exp - 3600) == (
+        exp - 3600 + TOKEN_CACHE_TTL
+    )
+
+
 # ==================== verify_refresh_token ====================
 
 
@@ -192,6 +225,17 @@ async def test_authenticate_user_wrong_email(db_session):
     assert result is False
 
 
+@pytest.mark.asyncio
+async def test_authenticate_user_wrong_email_still_verifies_password(db_session):
+    with patch(
+        "src.auth.service.verify_password", wraps=verify_password
+    ) as mock_verify:
+        result = await authenticate_user("nonexistent@test.com", "password", db_session)
+
+    assert result is False
+    mock_verify.assert_called_once_with("password", _DUMMY_PASSWORD_HASH)
+
+
 @pytest.mark.asyncio
 async def test_authenticate_user_wrong_password(db_session):
     user = User(
@@ -297,6 +341,60 @@ async def test_get_current_user_from_db_not_found(db_session):
     assert exc_info.value.detail == "User not found"
 
 
+@pytest.mark.asyncio
+async def test_get_current_user_with_item_ids(db_session):
+    user = User(
+        id=uuid4(),
+        email="items@test.com",
+        password_hash="hash",
+        first_name="Test",
+        last_name="User",
+    )
+    item_ids = [uuid4(), uuid4()]
+    db_session.add(user)
+    db_session.add_all(
+        OpenFinanceItem(id=item_id, user_id=user.id, pluggy_item_id=str(item_id))
+        for item_id in item_ids
+    )
+    await db_session.commit()
+
+    token = create_access_token(email=user.email, user_id=user.id)
+    current_user, fetched_ids = await get_current_user_with_item_ids(
+        token, db_session
+    )
+    assert current_user.id == user.id
+    assert sorted(fetched_ids) == sorted(item_ids)
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_with_item_ids_without_items(db_session):
+    user = User(
+        id=uuid4(),
+        email="noitems@test.com",
+        password_hash="hash",
+        first_name="Test",
+        last_name="User",
+    )
+    db_session.add(user)
+    await db_session.commit()
+
+    token = create_access_token(email=user.email, user_id=user.id)
+    current_user, fetched_ids = await get_current_user_with_item_ids(
+        token, db_session
+    )
+    assert current_user.id == user.id
+    assert fetched_ids == []
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_with_item_ids_not_found(db_session):
+    token = create_access_token(email="deleted@test.com", user_id=uuid4())
+
+    with pytest.raises(AuthenticationError) as exc_info:
+        await get_current_user_with_item_ids(token, db_session)
+    assert exc_info.value.detail == "User not found"
+
+
 # ==================== get_current_admin ====================
 
 
@@ -1,8 +1,10 @@
 import pytest
 from uuid import uuid4
-from src.categories import service
+from sqlalchemy import func, select
+from src.categories import service, model
 from src.entities.category import Category
 from src.entities.category import UserCategorySetting
+from src.exceptions.categories import CategoryNotFoundError
 
 
 @pytest.mark.asyncio
@@ -124,4 +126,145 @@ async def test_search_categories_filter(db_session, test_user):
     )
     names_ignored = [c.name for c in res_ignored.items]
     assert "Ignored Cat" in names_ignored
-    assert "General Cat" not in names_ignored
\ No newline at end of file
+    assert "General Cat" not in names_ignored
+
+
+@pytest.mark.asyncio
+async def test_get_categories_cache_invalidated_by_user_settings(db_session, test_user):
+    category = Category(name="Cached Cat", slug="cached-cat", color_hex="#111111")
+    db_session.add(category)
+    await db_session.commit()
+
+    first = await service.get_categories(test_user, db_session)
+    assert [c.alias for c in first] == [None]
+
+    # Served from cache while nothing changed
+    assert await service.get_categories(test_user, db_session) is first
+
+    await service.update_category_settings(
+        test_user,
+        db_session,
+        category.id,
+        model.CategorySettingsUpdate(alias="Meu Alias", color_hex="#111111"),
+    )
+
+    refreshed = await service.get_categories(test_user, db_session)
+    assert [c.alias for c in refreshed] == ["Meu Alias"]
+    # Global view is unaffected by user settings
+    global_view = await service.get_categories(test_user, db_session, view="global")
+    assert [c.alias for c in global_view] == [None]
+
+
+@pytest.mark.asyncio
+async def test_update_category_settings_upserts_and_removes(db_session, test_user):
+    category = Category(name="Upsert Cat", slug="upsert-cat", color_hex="#111111")
+    db_session.add(category)
+    await db_session.commit()
+
+    first = await service.update_category_settings(
+        test_user, db_session, category.id, model.CategorySettingsUpdate(alias="A")
+    )
+    assert first.alias == "A"
+
+    # Existing setting: ON CONFLICT path updates the same row
+    second = await service.update_category_settings(
+        test_user,
+        db_session,
+        category.id,
+        model.CategorySettingsUpdate(alias="B", color_hex="#222222"),
+    )
+    assert second.alias == "B"
+    assert second.color_hex == "#222222"
+    count = await db_session.scalar(
+        select(func.count()).select_from(UserCategorySetting)
+    )
+    assert count == 1
+
+    # Back to the global values: the redundant setting is deleted
+    third = await service.update_category_settings(
+        test_user,
+        db_session,
+        category.id,
+        model.CategorySettingsUpdate(alias="", color_hex="#111111"),
+    )
+    assert third.alias is None
+    assert third.color_hex == "#111111"
+    count = await db_session.scalar(
+        select(func.count()).select_from(UserCategorySetting)
+    )
+    assert count == 0
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_missing_category_raise(db_session, test_user):
+    with pytest.raises(CategoryNotFoundError):
+        await service.update_category(
+            test_user, db_session, uuid4(), model.CategoryUpdate(name="Nope")
+        )
+    with pytest.raises(CategoryNotFoundError):
+        await service.delete_category(test_user, db_session, uuid4())
+
+
+@pytest.mark.asyncio
+async def test_update_category_returns_user_overlay(db_session, test_user):
+    category = Category(name="Old Name", slug="old-name", color_hex="#111111")
+    db_session.add(category)
+    await db_session.commit()
+    await service.update_category_settings(
+        test_user,
+        db_session,
+        category.id,
+        model.CategorySettingsUpdate(alias="Mine", color_hex="#222222"),
+    )
+
+    updated = await service.update_category(
+        test_user, db_session, category.id, model.CategoryUpdate(name="New Name")
+    )
+    assert updated.name == "New Name"
+    assert updated.alias == "Mine"
+    assert updated.color_hex == "#222222"
+    assert updated == await service.get_category_by_id(
+        test_user, db_session, category.id
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_category_descendants_missing_category(db_session):
+    missing_id = uuid4()
+    assert await service.get_category_descendants(db_session, missing_id) == [
+        missing_id
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_categories_total_with_window_count(db_session, test_user):
+    for i in range(3):
+        db_session.add(
+            Category(name=f"Paged {i}", slug=f"paged-{i}", color_hex="#111111")
+        )
+    await db_session.commit()
+
+    first = await service.search_categories(
+        test_user, db_session, query_str="Paged", page=1, limit=2, scope="all"
+    )
+    assert [c.name for c in first.items] == ["Paged 0", "Paged 1"]
+    assert first.total == 3
+    assert first.pages == 2
+
+    beyond = await service.search_categories(
+        test_user, db_session, query_str="Paged", page=5, limit=2, scope="all"
+    )
+    assert beyond.items == []
+    assert beyond.total == 3
+
+
+@pytest.mark.asyncio
+async def test_search_categories_treats_wildcards_literally(db_session, test_user):
+    db_session.add(Category(name="Desconto 50%", slug="desconto-50", color_hex="#111111"))
+    db_session.add(Category(name="Desconto 500", slug="desconto-500", color_hex="#111111"))
+    await db_session.commit()
+
+    res = await service.search_categories(
+        test_user, db_session, query_str="50%", limit=100, scope="all"
+    )
+    assert [c.name for c in res.items] == ["Desconto 50%"]
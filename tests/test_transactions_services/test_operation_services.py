@@ -3,6 +3,7 @@ import uuid
 from datetime import date, timedelta
 from decimal import Decimal
 from unittest.mock import AsyncMock, patch
+from sqlalchemy import event
 
 from src.transactions import service, model
 from src.entities.transaction import TransactionType, TransactionMethod
@@ -187,8 +188,42 @@ async def test_bulk_create_transaction(
 
     created = await service.bulk_create_transaction(token_data, db_session, payloads)
     assert len(created) == 2
-    assert created[0].title == "Bulk 1"
-    assert created[1].title == "Bulk 2"
+    assert {t.title for t in created} == {"Bulk 1", "Bulk 2"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_transaction_single_insert_statement(
+    db_session, token_data, sample_category, sample_bank
+):
+    payloads = [
+        model.TransactionCreate(
+            title=f"Bulk {i}",
+            amount=Decimal("-10.00"),
+            date=date.today(),
+            category_id=sample_category.id,
+            bank_id=sample_bank.id,
+        )
+        for i in range(50)
+    ]
+
+    inserts = []
+
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO TRANSACTIONS"):
+            inserts.append(statement)
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", count_inserts)
+    try:
+        created = await service.bulk_create_transaction(
+            token_data, db_session, payloads
+        )
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count_inserts)
+
+    assert len(created) == 50
+    # As 50 linhas vão num único INSERT multi-VALUES, não uma por linha
+    assert len(inserts) == 1
 
 
 @pytest.mark.asyncio